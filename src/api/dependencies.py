@@ -3,7 +3,7 @@ FastAPI依赖注入工厂函数
 
 提供所有服务层和存储层的依赖注入
 """
-from fastapi import Depends
+from fastapi import Depends, Request
 
 from src.config import Settings, get_settings
 from src.services.ai_service import AIService
@@ -24,10 +24,18 @@ def get_s3_client(settings: Settings = Depends(get_settings)) -> S3ClientWrapper
 
 
 def get_meeting_repository(
-    s3_client: S3ClientWrapper = Depends(get_s3_client),
+    request: Request, s3_client: S3ClientWrapper = Depends(get_s3_client)
 ) -> MeetingRepository:
-    """获取会议记录仓库实例"""
-    return MeetingRepository(s3_client)
+    """获取会议记录仓库实例
+
+    优先使用lifespan中建立并挂在app.state.meeting_repository上的应用级仓库，
+    使条件GET缓存和摘要索引跨请求生效；未运行lifespan时(如ASGITransport测试)
+    按请求由get_s3_client构建。测试可删除app.state.meeting_repository重置缓存。
+    """
+    meeting_repo = getattr(request.app.state, "meeting_repository", None)
+    if meeting_repo is None:
+        meeting_repo = MeetingRepository(s3_client)
+    return meeting_repo
 
 
 def get_template_repository(
@@ -25,6 +25,7 @@ from src.api.middleware import (
 from src.api.middleware.error_handler import pydantic_exception_handler
 from src.api.middleware.logger import configure_json_logging, configure_standard_logging
 from src.config import get_settings
+from src.storage.meeting_repository import MeetingRepository
 from src.storage.s3_client import S3ClientWrapper
 from src.storage.template_repository import TemplateRepository
 
@@ -47,6 +48,7 @@ async def lifespan(app: FastAPI):
     启动时:
     - 初始化S3客户端
     - 创建默认模板(如果不存在)
+    - 创建应用级会议记录仓库
 
     关闭时:
     - 清理资源
@@ -61,11 +63,16 @@ async def lifespan(app: FastAPI):
     template_repo = TemplateRepository(s3_client)
     await template_repo._ensure_default_template()
 
+    # 仓库挂在app.state上，条件GET缓存和索引只在本应用实例内共享
+    # 内存索引在首次筛选时按需建立，启动时不扫描S3
+    app.state.meeting_repository = MeetingRepository(s3_client)
+
     logger.info("Application startup complete")
 
     yield
 
     logger.info("Shutting down application...")
+    del app.state.meeting_repository
 
 
 app = FastAPI(
@@ -3,9 +3,11 @@
 
 提供会议记录的CRUD操作和工作流控制
 """
+import asyncio
+import json
 import logging
 import uuid
-from datetime import datetime, UTC
+from datetime import UTC, datetime
 from typing import Optional
 
 from fastapi import (
@@ -17,7 +19,7 @@ from fastapi import (
     HTTPException,
     UploadFile,
 )
-from fastapi.responses import PlainTextResponse
+from fastapi.responses import PlainTextResponse, StreamingResponse
 
 from src.api.dependencies import (
     get_file_service,
@@ -34,6 +36,12 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# 状态流: 服务端检查状态变化的间隔与单个连接的最长持续时间(秒)
+STATUS_STREAM_POLL_INTERVAL = 1.0
+STATUS_STREAM_TIMEOUT = 600
+# 进入这些状态后需要用户操作才会继续变化，状态流随即结束
+STATUS_STREAM_FINAL_STATUSES = frozenset({"reviewing", "completed", "failed"})
+
 
 @router.post("/meetings", status_code=202)
 async def create_meeting(
@@ -210,6 +218,61 @@ async def get_meeting(
     return meeting.model_dump(mode="json")
 
 
+@router.get("/meetings/{meeting_id}/status/stream")
+async def stream_meeting_status(
+    meeting_id: str, meeting_repo: MeetingRepository = Depends(get_meeting_repository)
+):
+    """以SSE推送会议状态变化
+
+    在一个长连接上为每次状态变化发送一条事件(data为JSON)，
+    客户端无需反复轮询会议详情。会议进入需要用户操作的状态或超时后结束。
+
+    Args:
+        meeting_id: 会议记录ID(UUID)
+        meeting_repo: 会议记录仓库(依赖注入)
+
+    Returns:
+        text/event-stream流式响应
+
+    Raises:
+        HTTPException 404: 会议记录不存在
+    """
+    meeting = await meeting_repo.get(meeting_id)
+    if not meeting:
+        raise HTTPException(status_code=404, detail=f"会议 {meeting_id} 不存在")
+
+    async def status_events():
+        current = meeting
+        last_status = None
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + STATUS_STREAM_TIMEOUT
+
+        while True:
+            if current.status != last_status:
+                last_status = current.status
+                event = {
+                    "id": current.id,
+                    "status": current.status,
+                    "updated_at": current.updated_at.isoformat(),
+                }
+                yield f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+            if last_status in STATUS_STREAM_FINAL_STATUSES or loop.time() >= deadline:
+                return
+
+            await asyncio.sleep(STATUS_STREAM_POLL_INTERVAL)
+            # 仓库的条件GET缓存使未变化的会议只需一次轻量请求
+            current = await meeting_repo.get(meeting_id)
+            if current is None:
+                return
+
+    return StreamingResponse(
+        status_events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
 @router.post("/meetings/{meeting_id}/feedback", status_code=202)
 async def submit_feedback(
     meeting_id: str,
@@ -1,9 +1,26 @@
 """会议记录仓库"""
-from typing import Optional, List
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional, List, Dict, Any, Tuple
 from datetime import datetime
+from botocore.exceptions import ClientError
 from src.models.meeting import MeetingMinute, ProcessingStage, ReviewStage
 from src.storage.s3_client import S3ClientWrapper
 
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class MeetingSummary:
+    """内存索引中的会议摘要"""
+
+    id: str
+    status: str
+    created_at: datetime
+    etag: Optional[str] = None
+
 
 class MeetingRepository:
     """
@@ -12,6 +29,16 @@ class MeetingRepository:
     负责会议记录的持久化和检索
     """
 
+    # 预先绑定的键格式化函数，避免每次调用时拼接前缀
+    _MEETING_KEY = (S3ClientWrapper.MEETINGS_PREFIX + "{}.json").format
+    _AUDIO_KEY = (S3ClientWrapper.AUDIO_PREFIX + "{}").format
+
+    # 条件GET缓存的最大条目数
+    BODY_CACHE_SIZE = 256
+
+    # 内存索引的有效期（秒），过期后重新全量扫描以感知其他实例的写入
+    INDEX_TTL_SECONDS = 60
+
     def __init__(self, s3_client: S3ClientWrapper):
         """
         初始化会议记录仓库
@@ -20,6 +47,74 @@ class MeetingRepository:
             s3_client: S3客户端实例
         """
         self.s3 = s3_client
+        # 每进程LRU缓存: key -> (ETag, 会议数据)，用于条件GET
+        self._body_cache: OrderedDict[str, Tuple[str, Dict[str, Any]]] = OrderedDict()
+        # 会议摘要索引: id -> MeetingSummary，首次筛选时由全量扫描建立
+        self._index: Optional[Dict[str, MeetingSummary]] = None
+        self._index_built_at = 0.0
+
+    def _cache_body(self, key: str, etag: Optional[str], data: Dict[str, Any]) -> None:
+        """写入条件GET缓存，超出容量时淘汰最久未使用的条目"""
+        if not etag:
+            return
+        self._body_cache[key] = (etag, data)
+        self._body_cache.move_to_end(key)
+        if len(self._body_cache) > self.BODY_CACHE_SIZE:
+            self._body_cache.popitem(last=False)
+
+    def _index_meeting(self, meeting: MeetingMinute, etag: Optional[str]) -> None:
+        """写穿更新内存索引（索引尚未建立时跳过）"""
+        if self._index is not None:
+            self._index[meeting.id] = MeetingSummary(
+                id=meeting.id,
+                status=meeting.status,
+                created_at=meeting.created_at,
+                etag=etag
+            )
+
+    async def rebuild_index(self) -> None:
+        """全量扫描S3重建内存索引"""
+        await self.list_all()
+
+    async def _query_index(
+        self,
+        predicate: Callable[[MeetingSummary | MeetingMinute], bool],
+        limit: Optional[int] = None
+    ) -> List[MeetingMinute]:
+        """
+        在内存索引中筛选会议，仅加载命中的会议记录
+
+        Args:
+            predicate: 筛选条件，先作用于摘要，再作用于加载的记录以排除过时摘要
+            limit: 返回数量限制
+
+        Returns:
+            按创建时间降序排列的会议记录列表
+        """
+        if self._index is None or time.monotonic() - self._index_built_at > self.INDEX_TTL_SECONDS:
+            await self.rebuild_index()
+
+        summaries = sorted(
+            (s for s in self._index.values() if predicate(s)),
+            key=lambda s: s.created_at,
+            reverse=True
+        )
+        if limit is not None:
+            summaries = summaries[:limit]
+
+        meetings = []
+        for summary in summaries:
+            meeting = await self.get(summary.id)
+            if meeting is None:
+                # 已被其他实例删除
+                self._index.pop(summary.id, None)
+                continue
+            if not predicate(meeting):
+                # 摘要已过时（其他实例修改了状态），以最新记录刷新索引后跳过
+                self._index_meeting(meeting, None)
+                continue
+            meetings.append(meeting)
+        return meetings
 
     async def get(self, meeting_id: str) -> Optional[MeetingMinute]:
         """
@@ -31,15 +126,27 @@ class MeetingRepository:
         Returns:
             MeetingMinute实例或None
         """
-        key = f"{S3ClientWrapper.MEETINGS_PREFIX}{meeting_id}.json"
-        data = await self.s3.get_json(key)
-
-        if data is None:
-            return None
+        key = self._MEETING_KEY(meeting_id)
+        cached = self._body_cache.get(key)
 
         try:
+            data = await self.s3.get_json(key, if_none_match=cached[0] if cached else None)
+        except ClientError as e:
+            # 对象未变化，直接使用缓存的数据
+            if cached is None or e.response['Error']['Code'] not in ('304', 'NotModified'):
+                raise
+            self._body_cache.move_to_end(key)
+            etag, data = cached
+        else:
+            if data is None:
+                self._body_cache.pop(key, None)
+                return None
             # 保存ETag用于后续更新
             etag = data.pop('__etag', None)
+            self._cache_body(key, etag, data)
+
+        try:
+            # 模型校验会构建新的容器对象，缓存的数据不会被调用方修改
             meeting = MeetingMinute(**data)
 
             # 将ETag附加到实例上（用于并发控制）
@@ -59,7 +166,7 @@ class MeetingRepository:
         Returns:
             新的ETag值
         """
-        key = f"{S3ClientWrapper.MEETINGS_PREFIX}{meeting.id}.json"
+        key = self._MEETING_KEY(meeting.id)
 
         # 使用模型的model_dump方法获取数据
         data = meeting.model_dump(mode='json')
@@ -70,6 +177,8 @@ class MeetingRepository:
 
         # 保存到S3
         etag = await self.s3.put_json(key, data, if_match)
+        self._cache_body(key, etag, data)
+        self._index_meeting(meeting, etag)
 
         # 更新实例的ETag
         meeting.__dict__['__etag'] = etag
@@ -79,11 +188,14 @@ class MeetingRepository:
         """
         列出所有会议记录
 
+        全量扫描的结果同时用于重建内存索引
+
         Returns:
             会议记录列表
         """
         keys = await self.s3.list_keys(S3ClientWrapper.MEETINGS_PREFIX)
         meetings = []
+        index: Dict[str, MeetingSummary] = {}
 
         for key in keys:
             # 跳过非JSON文件
@@ -94,14 +206,23 @@ class MeetingRepository:
             if data:
                 try:
                     # 移除内部字段
-                    data.pop('__etag', None)
+                    etag = data.pop('__etag', None)
                     meeting = MeetingMinute(**data)
                     meetings.append(meeting)
+                    index[meeting.id] = MeetingSummary(
+                        id=meeting.id,
+                        status=meeting.status,
+                        created_at=meeting.created_at,
+                        etag=etag
+                    )
                 except Exception as e:
                     # 记录错误但继续处理其他文件
-                    print(f"警告: 无法解析文件 {key}: {str(e)}")
+                    logger.warning("无法解析文件 %s: %s", key, e)
                     continue
 
+        self._index = index
+        self._index_built_at = time.monotonic()
+
         # 按创建时间降序排序
         meetings.sort(key=lambda m: m.created_at, reverse=True)
         return meetings
@@ -116,8 +237,7 @@ class MeetingRepository:
         Returns:
             符合条件的会议记录列表
         """
-        all_meetings = await self.list_all()
-        return [m for m in all_meetings if m.status == status]
+        return await self._query_index(lambda s: s.status == status)
 
     async def update_stage(
         self,
@@ -155,11 +275,14 @@ class MeetingRepository:
             meeting_id: 会议记录ID
         """
         # 删除会议记录JSON
-        meeting_key = f"{S3ClientWrapper.MEETINGS_PREFIX}{meeting_id}.json"
+        meeting_key = self._MEETING_KEY(meeting_id)
         await self.s3.delete(meeting_key)
+        self._body_cache.pop(meeting_key, None)
+        if self._index is not None:
+            self._index.pop(meeting_id, None)
 
         # 可选：同时删除关联的音频文件
-        audio_key = f"{S3ClientWrapper.AUDIO_PREFIX}{meeting_id}"
+        audio_key = self._AUDIO_KEY(meeting_id)
         # 尝试删除各种音频格式
         for ext in ['.mp3', '.wav', '.mp4', '.m4a']:
             await self.s3.delete(f"{audio_key}{ext}")
@@ -174,7 +297,7 @@ class MeetingRepository:
         Returns:
             True如果存在，False否则
         """
-        key = f"{S3ClientWrapper.MEETINGS_PREFIX}{meeting_id}.json"
+        key = self._MEETING_KEY(meeting_id)
         return await self.s3.exists(key)
 
     async def get_recent(self, limit: int = 10) -> List[MeetingMinute]:
@@ -187,8 +310,7 @@ class MeetingRepository:
         Returns:
             最近的会议记录列表
         """
-        all_meetings = await self.list_all()
-        return all_meetings[:limit]
+        return await self._query_index(lambda s: True, limit=limit)
 
     async def search_by_date_range(
         self,
@@ -205,8 +327,6 @@ class MeetingRepository:
         Returns:
             符合日期范围的会议记录列表
         """
-        all_meetings = await self.list_all()
-        return [
-            m for m in all_meetings
-            if start_date <= m.created_at <= end_date
-        ]
\ No newline at end of file
+        return await self._query_index(
+            lambda s: start_date <= s.created_at <= end_date
+        )
\ No newline at end of file
@@ -1,8 +1,9 @@
 """S3客户端封装"""
-import json
+import gzip
 from typing import Optional, Any, Dict, List
 from botocore.exceptions import ClientError
 import boto3
+import orjson
 
 
 class S3ClientWrapper:
@@ -17,6 +18,9 @@ class S3ClientWrapper:
     TEMPLATES_PREFIX = "templates/"
     AUDIO_PREFIX = "audio/"
 
+    # JSON正文压缩级别，3级在CPU开销和压缩率之间取得平衡
+    GZIP_COMPRESS_LEVEL = 3
+
     def __init__(self, bucket_name: str, region: str = "us-east-1"):
         """
         初始化S3客户端
@@ -28,22 +32,40 @@ class S3ClientWrapper:
         self.bucket_name = bucket_name
         self.s3 = boto3.client('s3', region_name=region)
 
-    async def get_json(self, key: str) -> Optional[Dict[str, Any]]:
+    async def get_json(
+        self,
+        key: str,
+        if_none_match: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
         """
         从S3读取JSON对象
 
         Args:
             key: S3对象键
+            if_none_match: ETag值，对象未变化时S3返回304且不传输正文
 
         Returns:
             JSON对象或None(如果不存在)
 
         Raises:
-            ClientError: S3操作失败(除了NoSuchKey)
+            ClientError: S3操作失败(除了NoSuchKey)，对象未变化时错误码为304
         """
+        params = {'Bucket': self.bucket_name, 'Key': key}
+        if if_none_match:
+            params['IfNoneMatch'] = if_none_match
+
         try:
-            response = self.s3.get_object(Bucket=self.bucket_name, Key=key)
-            data = json.loads(response['Body'].read().decode('utf-8'))
+            response = self.s3.get_object(**params)
+            body = response['Body']
+            if response.get('ContentEncoding') == 'gzip':
+                # 边读边解压，避免同时持有压缩和解压后的两份正文
+                with gzip.GzipFile(fileobj=body) as gz:
+                    raw = gz.read()
+            else:
+                # 兼容未压缩的历史对象
+                raw = body.read()
+            # orjson直接解析bytes，省去UTF-8解码得到的中间字符串
+            data = orjson.loads(raw)
             # 保存ETag用于后续的条件更新
             data['__etag'] = response.get('ETag', '').strip('"')
             return data
@@ -61,6 +83,8 @@ class S3ClientWrapper:
         """
         保存JSON对象到S3
 
+        正文以紧凑JSON序列化后gzip压缩，并设置ContentEncoding: gzip
+
         Args:
             key: S3对象键
             data: 要保存的数据
@@ -76,12 +100,14 @@ class S3ClientWrapper:
         data_copy = data.copy()
         data_copy.pop('__etag', None)
 
-        body = json.dumps(data_copy, ensure_ascii=False, indent=2)
+        raw = orjson.dumps(data_copy)
+        body = gzip.compress(raw, compresslevel=self.GZIP_COMPRESS_LEVEL)
         params = {
             'Bucket': self.bucket_name,
             'Key': key,
             'Body': body,
-            'ContentType': 'application/json'
+            'ContentType': 'application/json',
+            'ContentEncoding': 'gzip'
         }
 
         # 添加条件更新参数
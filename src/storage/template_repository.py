@@ -1,10 +1,13 @@
 """模板仓库"""
+import logging
 from typing import Optional, List
 from datetime import datetime, timezone
 from uuid import uuid4
 from src.models.template import Template, DEFAULT_TEMPLATE
 from src.storage.s3_client import S3ClientWrapper
 
+logger = logging.getLogger(__name__)
+
 
 class TemplateRepository:
     """
@@ -13,6 +16,9 @@ class TemplateRepository:
     负责模板的持久化和检索
     """
 
+    # 预先绑定的键格式化函数，避免每次调用时拼接前缀
+    _TEMPLATE_KEY = (S3ClientWrapper.TEMPLATES_PREFIX + "{}.json").format
+
     def __init__(self, s3_client: S3ClientWrapper):
         """
         初始化模板仓库
@@ -26,7 +32,7 @@ class TemplateRepository:
 
     async def _ensure_default_template(self):
         """确保默认模板存在"""
-        default_key = f"{S3ClientWrapper.TEMPLATES_PREFIX}default.json"
+        default_key = self._TEMPLATE_KEY("default")
         if not await self.s3.exists(default_key):
             # 保存默认模板
             await self.save(DEFAULT_TEMPLATE)
@@ -41,7 +47,7 @@ class TemplateRepository:
         Returns:
             Template实例或None
         """
-        key = f"{S3ClientWrapper.TEMPLATES_PREFIX}{template_id}.json"
+        key = self._TEMPLATE_KEY(template_id)
         data = await self.s3.get_json(key)
 
         if data is None:
@@ -61,7 +67,7 @@ class TemplateRepository:
         Args:
             template: 模板实例
         """
-        key = f"{S3ClientWrapper.TEMPLATES_PREFIX}{template.id}.json"
+        key = self._TEMPLATE_KEY(template.id)
 
         # 处理datetime序列化
         data = template.model_dump(mode='json')
@@ -71,17 +77,26 @@ class TemplateRepository:
         # 保存到S3
         await self.s3.put_json(key, data)
 
-    async def list_all(self) -> List[Template]:
+    async def list_all(self, include_default: bool = True) -> List[Template]:
         """
         列出所有模板
 
+        Args:
+            include_default: 是否包含默认模板
+
         Returns:
             模板列表
         """
-        # 确保默认模板存在
-        await self._ensure_default_template()
+        if include_default:
+            # 确保默认模板存在
+            await self._ensure_default_template()
 
         keys = await self.s3.list_keys(S3ClientWrapper.TEMPLATES_PREFIX)
+
+        if not include_default:
+            # 按键名过滤默认模板，避免下载和解析
+            keys = [k for k in keys if not k.endswith('/default.json')]
+
         templates = []
 
         for key in keys:
@@ -98,7 +113,7 @@ class TemplateRepository:
                     templates.append(template)
                 except Exception as e:
                     # 记录错误但继续处理其他文件
-                    print(f"警告: 无法解析文件 {key}: {str(e)}")
+                    logger.warning("无法解析文件 %s: %s", key, e)
                     continue
 
         # 按创建时间降序排序，默认模板始终在前
@@ -163,7 +178,7 @@ class TemplateRepository:
         if template_id == "default":
             raise ValueError("不能删除默认模板")
 
-        key = f"{S3ClientWrapper.TEMPLATES_PREFIX}{template_id}.json"
+        key = self._TEMPLATE_KEY(template_id)
         await self.s3.delete(key)
 
     async def exists(self, template_id: str) -> bool:
@@ -176,7 +191,7 @@ class TemplateRepository:
         Returns:
             True如果存在，False否则
         """
-        key = f"{S3ClientWrapper.TEMPLATES_PREFIX}{template_id}.json"
+        key = self._TEMPLATE_KEY(template_id)
         return await self.s3.exists(key)
 
     async def update(self, template_id: str, name: Optional[str] = None, structure: Optional[dict] = None) -> Template:
@@ -220,5 +235,4 @@ class TemplateRepository:
         Returns:
             用户模板列表
         """
-        all_templates = await self.list_all()
-        return [t for t in all_templates if not t.is_default]
\ No newline at end of file
+        return await self.list_all(include_default=False)
\ No newline at end of file
@@ -1,13 +1,43 @@
 """
 Pytest配置和共享fixtures - 使用真实AWS资源
 """
+import asyncio
+import hashlib
+import io
+import json
 import os
+import sys
+from contextlib import contextmanager
+from datetime import datetime, UTC
+from pathlib import Path
+from types import SimpleNamespace
 import pytest
+import pytest_asyncio
 import boto3
+from botocore.exceptions import ClientError
+from botocore.response import StreamingBody
 from httpx import AsyncClient, ASGITransport
+from pytest_asyncio import is_async_test
 from src.api.main import app
 
 
+def pytest_collection_modifyitems(items):
+    """所有异步测试共享会话级事件循环，使会话级异步fixture可以跨测试复用"""
+    session_loop_marker = pytest.mark.asyncio(loop_scope="session")
+    for item in items:
+        if is_async_test(item):
+            item.add_marker(session_loop_marker, append=False)
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    """非Windows平台使用uvloop事件循环，降低异步网络I/O的调度开销"""
+    if sys.platform == "win32":
+        return asyncio.DefaultEventLoopPolicy()
+    import uvloop
+    return uvloop.EventLoopPolicy()
+
+
 @pytest.fixture(scope="session")
 def aws_credentials():
     """确保AWS凭证已配置（从环境变量或~/.aws/credentials）"""
@@ -18,15 +48,121 @@ def aws_credentials():
     yield
 
 
-@pytest.fixture(scope="function")
+# TEST_S3_BACKEND=memory时用进程内的FakeS3替代S3，省去每次调用的HTTP往返
+S3_BACKEND = os.getenv("TEST_S3_BACKEND", "aws").lower()
+
+
+class FakeS3:
+    """进程内的S3替身，只实现应用和测试用到的接口
+
+    对象以(bucket, key)为键保存在内存字典中，错误以与boto3相同的ClientError抛出
+    """
+
+    def __init__(self):
+        self._objects = {}
+
+    @staticmethod
+    def _error(code, operation):
+        return ClientError({"Error": {"Code": code, "Message": code}}, operation)
+
+    def _head(self, obj):
+        return {k: v for k, v in obj.items() if k != "Body"}
+
+    def head_bucket(self, Bucket):  # noqa: N803
+        return {}
+
+    def create_bucket(self, Bucket, **kwargs):  # noqa: N803
+        return {}
+
+    def put_object(self, Bucket, Key, Body, ContentType="binary/octet-stream",  # noqa: N803
+                   ContentEncoding=None, Metadata=None, IfMatch=None):  # noqa: N803
+        current = self._objects.get((Bucket, Key))
+        if IfMatch is not None and (current is None or current["ETag"].strip('"') != IfMatch):
+            raise self._error("PreconditionFailed", "PutObject")
+
+        body = Body if isinstance(Body, bytes) else Body.read()
+        obj = {
+            "Body": body,
+            "ContentLength": len(body),
+            "ContentType": ContentType,
+            "ETag": f'"{hashlib.md5(body).hexdigest()}"',
+            "LastModified": datetime.now(UTC),
+            "Metadata": Metadata or {},
+        }
+        if ContentEncoding:
+            obj["ContentEncoding"] = ContentEncoding
+        self._objects[(Bucket, Key)] = obj
+        return {"ETag": obj["ETag"]}
+
+    def get_object(self, Bucket, Key, IfNoneMatch=None):  # noqa: N803
+        obj = self._objects.get((Bucket, Key))
+        if obj is None:
+            raise self._error("NoSuchKey", "GetObject")
+        if IfNoneMatch and obj["ETag"].strip('"') == IfNoneMatch.strip('"'):
+            raise self._error("304", "GetObject")
+        return {**self._head(obj), "Body": io.BytesIO(obj["Body"])}
+
+    def head_object(self, Bucket, Key):  # noqa: N803
+        obj = self._objects.get((Bucket, Key))
+        if obj is None:
+            raise self._error("404", "HeadObject")
+        return self._head(obj)
+
+    def delete_object(self, Bucket, Key):  # noqa: N803
+        self._objects.pop((Bucket, Key), None)
+        return {}
+
+    def list_objects_v2(self, Bucket, Prefix=""):  # noqa: N803
+        keys = sorted(k for b, k in self._objects if b == Bucket and k.startswith(Prefix))
+        page = {"KeyCount": len(keys)}
+        if keys:
+            page["Contents"] = [
+                {"Key": k, "Size": self._objects[(Bucket, k)]["ContentLength"]} for k in keys
+            ]
+        return page
+
+    def get_paginator(self, operation_name):
+        # 内存中不需要分页，单页返回全部结果
+        return SimpleNamespace(
+            paginate=lambda **kwargs: [getattr(self, operation_name)(**kwargs)]
+        )
+
+    def generate_presigned_url(self, ClientMethod, Params, ExpiresIn=3600):  # noqa: N803
+        return f"memory://{Params['Bucket']}/{Params['Key']}"
+
+
+def _reset_meeting_repository():
+    """丢弃lifespan挂在app.state上的会议仓库，之后的请求按当前S3客户端重建"""
+    if hasattr(app.state, "meeting_repository"):
+        del app.state.meeting_repository
+
+
+@pytest.fixture(scope="session")
 def s3_client(aws_credentials):
-    """真实的S3客户端"""
+    """S3客户端：默认为真实的S3客户端，TEST_S3_BACKEND=memory时为FakeS3"""
     region = os.getenv("AWS_REGION", "us-east-1")
-    client = boto3.client("s3", region_name=region)
-    return client
+    if S3_BACKEND != "memory":
+        yield boto3.client("s3", region_name=region)
+        return
+
+    # 替换boto3.client工厂，应用内创建的S3客户端都指向同一个FakeS3，其余服务不受影响
+    fake_s3 = FakeS3()
+    real_client = boto3.client
 
+    def client_factory(service_name, *args, **kwargs):
+        if service_name == "s3":
+            return fake_s3
+        return real_client(service_name, *args, **kwargs)
 
-@pytest.fixture(scope="function")
+    # lifespan建立的应用级会议仓库持有创建时的S3客户端，进入和退出补丁时都丢弃
+    _reset_meeting_repository()
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(boto3, "client", client_factory)
+        yield fake_s3
+    _reset_meeting_repository()
+
+
+@pytest.fixture(scope="session")
 def test_bucket(s3_client):
     """使用真实的S3测试桶"""
     # 使用环境变量中的测试bucket，如果没有则使用默认名称
@@ -48,6 +184,10 @@ def test_bucket(s3_client):
                     Bucket=bucket_name,
                     CreateBucketConfiguration={'LocationConstraint': region}
                 )
+        except ClientError as e:
+            # pytest-xdist多个worker同时首次创建时，其余worker会收到此错误，桶已可用
+            if e.response["Error"]["Code"] != "BucketAlreadyOwnedByYou":
+                pytest.skip(f"无法创建测试bucket {bucket_name}: {e}")
         except Exception as e:
             pytest.skip(f"无法创建测试bucket {bucket_name}: {e}")
 
@@ -57,34 +197,137 @@ def test_bucket(s3_client):
     # 注意：不删除bucket本身，因为可能被多个测试使用
 
 
-@pytest.fixture
-async def async_client(test_bucket, monkeypatch):
-    """提供AsyncClient fixture用于API测试 - 使用真实AWS资源"""
-    # 设置环境变量
-    monkeypatch.setenv("S3_BUCKET_NAME", test_bucket)
+# Bedrock响应录制/回放: 按请求(modelId+body)的sha256保存到tests/fixtures/bedrock/
+# 该目录是本地缓存(已加入.gitignore)；默认只回放，未命中直接失败，
+# 设置VCR_MODE=new_episodes才会调用真实Bedrock并录制
+BEDROCK_CASSETTE_DIR = Path(__file__).parent / "fixtures" / "bedrock"
+VCR_MODE = os.getenv("VCR_MODE", "none").lower()
+
+
+class BedrockCassette:
+    """包装bedrock-runtime客户端，InvokeModel按请求哈希录制/回放，其余调用透传"""
+
+    def __init__(self, client, cassette_dir=BEDROCK_CASSETTE_DIR, mode=VCR_MODE):
+        self._client = client
+        self._dir = cassette_dir
+        self._mode = mode
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+    def invoke_model(self, *, modelId, body, **kwargs):  # noqa: N803
+        raw_body = body.encode("utf-8") if isinstance(body, str) else body
+        key = hashlib.sha256(modelId.encode("utf-8") + b"\n" + raw_body).hexdigest()
+        path = self._dir / f"{key}.json"
+
+        if path.exists():
+            data = path.read_bytes()
+        elif self._mode == "none":
+            raise RuntimeError(
+                f"缺少Bedrock录制 {path.name}，设置VCR_MODE=new_episodes后重新运行以录制"
+            )
+        else:
+            # 只有成功的调用会走到写文件，限流、权限等错误不会被录制
+            response = self._client.invoke_model(modelId=modelId, body=body, **kwargs)
+            data = response["body"].read()
+            self._dir.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+
+        return {
+            "body": StreamingBody(io.BytesIO(data), len(data)),
+            "contentType": "application/json",
+        }
 
-    # 使用真实的Bedrock模型
-    model_id = os.getenv("BEDROCK_MODEL_ID", "amazon.nova-pro-v1:0")
-    monkeypatch.setenv("BEDROCK_MODEL_ID", model_id)
 
-    # 不再mock音频duration，使用真实的音频文件解析
+@pytest.fixture(scope="session")
+def bedrock_cassette():
+    """应用内创建的bedrock-runtime客户端都经过BedrockCassette录制/回放"""
+    real_client = boto3.client
+
+    def client_factory(service_name, *args, **kwargs):
+        client = real_client(service_name, *args, **kwargs)
+        if service_name == "bedrock-runtime":
+            return BedrockCassette(client)
+        return client
 
-    transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://test") as client:
-        yield client
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(boto3, "client", client_factory)
+        yield
 
 
 @pytest.fixture
-async def async_client_with_aws(test_bucket, s3_client, monkeypatch):
-    """提供带真实AWS资源的AsyncClient"""
-    monkeypatch.setenv("S3_BUCKET_NAME", test_bucket)
+def bedrock_unavailable(bedrock_cassette, monkeypatch):
+    """InvokeModel在SDK边界返回ServiceUnavailableException，模拟Bedrock服务不可用
+
+    替换的是BedrockCassette而不是AIService内部方法，AI服务的请求构建与错误处理照常执行
+    """
+    def invoke_model(self, *, modelId, body, **kwargs):  # noqa: N803
+        raise ClientError(
+            {"Error": {"Code": "ServiceUnavailableException", "Message": "Bedrock服务不可用"}},
+            "InvokeModel",
+        )
 
-    model_id = os.getenv("BEDROCK_MODEL_ID", "amazon.nova-pro-v1:0")
-    monkeypatch.setenv("BEDROCK_MODEL_ID", model_id)
+    monkeypatch.setattr(BedrockCassette, "invoke_model", invoke_model)
 
-    transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://test") as client:
-        yield client, test_bucket, s3_client
+
+@pytest.fixture(scope="session")
+def bedrock_stub(bedrock_cassette):
+    """返回上下文管理器，期间InvokeModel在SDK边界立即返回给定文本的固定响应
+
+    可在类级或模块级fixture中使用，AI服务的请求构建与响应解析照常执行
+    """
+    @contextmanager
+    def stub(text):
+        data = json.dumps(
+            {"output": {"message": {"content": [{"text": text}]}}, "usage": {}}
+        ).encode("utf-8")
+
+        def invoke_model(self, *, modelId, body, **kwargs):  # noqa: N803
+            return {
+                "body": StreamingBody(io.BytesIO(data), len(data)),
+                "contentType": "application/json",
+            }
+
+        with pytest.MonkeyPatch.context() as monkeypatch:
+            monkeypatch.setattr(BedrockCassette, "invoke_model", invoke_model)
+            yield
+
+    return stub
+
+
+@pytest_asyncio.fixture(scope="session")
+async def async_client(test_bucket, bedrock_cassette):
+    """提供AsyncClient fixture用于API测试 - 使用真实AWS资源
+
+    会话级共享，避免每个测试重建客户端和事件循环
+    """
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        # 设置环境变量
+        monkeypatch.setenv("S3_BUCKET_NAME", test_bucket)
+
+        # 使用真实的Bedrock模型
+        model_id = os.getenv("BEDROCK_MODEL_ID", "amazon.nova-pro-v1:0")
+        monkeypatch.setenv("BEDROCK_MODEL_ID", model_id)
+
+        # 不再mock音频duration，使用真实的音频文件解析
+
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            # 预热: 首个请求完成应用的路由与中间件初始化，并提前加载bedrock-runtime的服务模型，
+            # 避免xdist下每个worker的第一个测试承担这部分一次性开销
+            # (S3已由test_bucket的head_bucket预热)
+            await client.get("/health")
+            boto3.client("bedrock-runtime", region_name=os.getenv("AWS_REGION", "us-east-1"))
+            yield client
+
+
+@pytest.fixture(scope="session")
+def async_client_with_aws(async_client, test_bucket, s3_client):
+    """提供带真实AWS资源的AsyncClient
+
+    复用会话级的async_client，各测试的S3对象以各自唯一的meeting_id为前缀，互不干扰
+    """
+    return async_client, test_bucket, s3_client
 
 
 @pytest.fixture(scope="session")
@@ -2,9 +2,98 @@
 Contract tests specific configuration.
 
 This conftest is for contract tests that don't need the full application setup.
+By default requests are dispatched in-process to the FastAPI app; set
+USE_LIVE_SERVER=1 to run the suite against a server listening on BASE_URL.
+
+Modules marked with ``pytest.mark.vcr`` replay live-server responses from YAML
+cassettes under ``tests/contract/cassettes/``; the in-process ASGI path is never
+recorded or replayed. A missing cassette is recorded on the first live run
+(``record_mode: once``) and replayed thereafter; run against a server seeded
+with the sample meeting, delete a cassette to re-record it, or bypass them with
+``--disable-recording``.
 """
+import os
+import re
+
+import httpx
 import pytest
+import pytest_asyncio
 
+from src.api.main import app
 
 # Contract tests run against a real or mock API endpoint
-# No application fixtures needed here
+BASE_URL = "http://localhost:8000"
+USE_LIVE_SERVER = os.getenv("USE_LIVE_SERVER", "").lower() in ("1", "true", "yes")
+
+_UUID_RE = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+
+
+def _meeting_path(r1, r2):
+    """Match request paths regardless of the meeting UUID embedded in them."""
+    assert _UUID_RE.sub("<id>", r1.path) == _UUID_RE.sub("<id>", r2.path)
+
+
+def _api_requests_only(request):
+    """Record only calls to the API under test, not the app's own AWS traffic."""
+    return request if "/api/" in request.path else None
+
+
+def pytest_recording_configure(config, vcr):
+    vcr.register_matcher("meeting_path", _meeting_path)
+
+
+@pytest.fixture(scope="module")
+def vcr_config():
+    return {
+        "record_mode": "once",
+        "match_on": ["method", "meeting_path", "query"],
+        "before_record_request": _api_requests_only,
+    }
+
+
+@pytest_asyncio.fixture(scope="session")
+async def client(s3_client):
+    """
+    Session-scoped pooled HTTP client.
+
+    A single client is shared by the whole suite so keep-alive connections
+    amortize the connection handshake across tests. In the default in-process
+    mode the ASGI transport calls the app directly without opening sockets.
+    Depending on ``s3_client`` makes TEST_S3_BACKEND=memory take effect before
+    the app builds any S3 client.
+    """
+    if USE_LIVE_SERVER:
+        client_kwargs = {
+            "base_url": BASE_URL,
+            # uvicorn only speaks HTTP/1.1: keep every pooled connection alive so
+            # gathered requests reuse a warm pool instead of reconnecting
+            "limits": httpx.Limits(max_keepalive_connections=100, max_connections=100),
+        }
+    else:
+        client_kwargs = {
+            "base_url": "http://testserver",
+            "transport": httpx.ASGITransport(app=app),
+        }
+
+    async with httpx.AsyncClient(
+        headers={"Accept": "text/markdown, application/json"},
+        timeout=10.0,
+        **client_kwargs,
+    ) as client:
+        yield client
+
+
+@pytest_asyncio.fixture(scope="session", autouse=True)
+async def _ensure_server(client):
+    """
+    Probe the live server once per session.
+
+    If it is unreachable, the cached skip applies to every contract test
+    instead of each one waiting out its own connection timeout.
+    """
+    if not USE_LIVE_SERVER:
+        return
+    try:
+        await client.get("/health", timeout=1.0)
+    except httpx.TransportError as e:
+        pytest.skip(f"API server at {BASE_URL} is not reachable: {e}")
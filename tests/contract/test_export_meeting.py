@@ -5,97 +5,99 @@ Tests verify the API contract defined in api-spec.yaml for exporting meeting min
 as Markdown in different stages (draft, review, final).
 """
 
-import uuid
+import asyncio
+import os
+import re
+
 import pytest
-from httpx import AsyncClient
 
 
-BASE_URL = "http://localhost:8000"
 API_PREFIX = "/api/v1"
 
+# Fixed, v4-shaped meeting IDs keep request URLs stable across runs
+SAMPLE_MEETING_ID = "00000000-0000-4000-8000-000000000001"
+NON_EXISTENT_MEETING_ID = "00000000-0000-4000-8000-0000000000ff"
+
+# Any common Markdown formatting token, matched in a single pass over the body
+_MD_TOKEN_RE = re.compile(r"[#\-*]")
+
+pytestmark = [pytest.mark.xdist_group("contract_export")]
+# Cassettes only stand in for a live server; in-process runs always exercise the app
+if os.getenv("USE_LIVE_SERVER", "").lower() in ("1", "true", "yes"):
+    pytestmark.append(pytest.mark.vcr)
+
 
 @pytest.mark.contract
 @pytest.mark.asyncio
-async def test_export_meeting_final_stage():
+@pytest.mark.parametrize(
+    "stage, accepted_statuses",
+    [
+        pytest.param(None, (200,), id="default"),
+        pytest.param("draft", (200,), id="draft"),
+        pytest.param("review", (200, 404), id="review"),
+        pytest.param("final", (200,), id="final"),
+    ],
+)
+async def test_export_meeting_stage(client, stage, accepted_statuses):
     """
-    Test exporting meeting in final stage (default).
+    Test exporting meeting in each stage.
 
     Verifies:
     - GET /api/v1/meetings/{meeting_id}/export returns 200
+      (the review stage may not exist yet and is allowed to return 404)
     - Default stage parameter is 'final'
     - Response Content-Type is text/markdown
     - Response body is non-empty Markdown text
     """
-    meeting_id = str(uuid.uuid4())
+    meeting_id = SAMPLE_MEETING_ID
+    params = {"stage": stage} if stage else None
+
+    async with client.stream(
+        "GET",
+        f"{API_PREFIX}/meetings/{meeting_id}/export",
+        params=params
+    ) as response:
+        # Only buffer the body when it is needed for the failure message
+        if response.status_code not in accepted_statuses:
+            await response.aread()
+
+        # Verify response status
+        assert response.status_code in accepted_statuses, (
+            f"Expected status in {accepted_statuses}, got {response.status_code}. "
+            f"Response: {response.text}"
+        )
 
-    async with AsyncClient(base_url=BASE_URL) as client:
-        response = await client.get(f"{API_PREFIX}/meetings/{meeting_id}/export")
+        if response.status_code != 200:
+            return
 
-    # Verify response status
-    assert response.status_code == 200, (
-        f"Expected status 200, got {response.status_code}. "
-        f"Response: {response.text}"
-    )
+        # Verify Content-Type is text/markdown
+        content_type = response.headers.get("content-type", "")
+        assert "text/markdown" in content_type, (
+            f"Expected Content-Type to contain 'text/markdown', got '{content_type}'"
+        )
 
-    # Verify Content-Type is text/markdown
-    content_type = response.headers.get("content-type", "")
-    assert "text/markdown" in content_type, (
-        f"Expected Content-Type to contain 'text/markdown', got '{content_type}'"
-    )
+        # Read only the prefix needed to spot Markdown formatting
+        prefix = b""
+        async for chunk in response.aiter_bytes(1024):
+            prefix += chunk
+            if len(prefix) >= 1024 or _MD_TOKEN_RE.search(
+                prefix.decode("utf-8", errors="ignore")
+            ):
+                break
 
     # Verify response body is non-empty Markdown
-    content = response.text
+    content = prefix.decode("utf-8", errors="ignore")
     assert len(content) > 0, "Response body should not be empty"
 
     # Basic Markdown validation - should contain common Markdown elements
-    assert "#" in content or "-" in content or "*" in content, (
+    assert _MD_TOKEN_RE.search(content) is not None, (
         "Response should contain Markdown formatting elements"
     )
 
 
 @pytest.mark.contract
 @pytest.mark.asyncio
-async def test_export_meeting_draft_stage():
-    """
-    Test exporting meeting in draft stage.
-
-    Verifies:
-    - GET /api/v1/meetings/{meeting_id}/export?stage=draft returns 200
-    - Stage parameter correctly filters to draft version
-    - Response Content-Type is text/markdown
-    - Response body is valid Markdown
-    """
-    meeting_id = str(uuid.uuid4())
-
-    async with AsyncClient(base_url=BASE_URL) as client:
-        response = await client.get(
-            f"{API_PREFIX}/meetings/{meeting_id}/export",
-            params={"stage": "draft"}
-        )
-
-    # Verify response status
-    assert response.status_code == 200, (
-        f"Expected status 200, got {response.status_code}. "
-        f"Response: {response.text}"
-    )
-
-    # Verify Content-Type is text/markdown
-    content_type = response.headers.get("content-type", "")
-    assert "text/markdown" in content_type, (
-        f"Expected Content-Type to contain 'text/markdown', got '{content_type}'"
-    )
-
-    # Verify response body is non-empty Markdown
-    content = response.text
-    assert len(content) > 0, "Response body should not be empty"
-    assert "#" in content or "-" in content or "*" in content, (
-        "Response should contain Markdown formatting elements"
-    )
-
-
-@pytest.mark.contract
-@pytest.mark.asyncio
-async def test_export_meeting_not_found():
+async def test_export_meeting_not_found(client):
     """
     Test exporting non-existent meeting.
 
@@ -104,10 +106,9 @@ async def test_export_meeting_not_found():
     - Response Content-Type is application/json
     - Response contains error message
     """
-    non_existent_id = str(uuid.uuid4())
+    non_existent_id = NON_EXISTENT_MEETING_ID
 
-    async with AsyncClient(base_url=BASE_URL) as client:
-        response = await client.get(f"{API_PREFIX}/meetings/{non_existent_id}/export")
+    response = await client.get(f"{API_PREFIX}/meetings/{non_existent_id}/export")
 
     # Verify 404 response
     assert response.status_code == 404, (
@@ -128,7 +129,7 @@ async def test_export_meeting_not_found():
 
 @pytest.mark.contract
 @pytest.mark.asyncio
-async def test_export_meeting_stage_not_exists():
+async def test_export_meeting_stage_not_exists(client):
     """
     Test exporting meeting with non-existent stage.
 
@@ -138,13 +139,12 @@ async def test_export_meeting_stage_not_exists():
     - Response Content-Type is application/json
     - Response contains appropriate error message
     """
-    meeting_id = str(uuid.uuid4())
+    meeting_id = SAMPLE_MEETING_ID
 
-    async with AsyncClient(base_url=BASE_URL) as client:
-        response = await client.get(
-            f"{API_PREFIX}/meetings/{meeting_id}/export",
-            params={"stage": "review"}
-        )
+    response = await client.get(
+        f"{API_PREFIX}/meetings/{meeting_id}/export",
+        params={"stage": "review"}
+    )
 
     # Verify 404 response when stage doesn't exist
     assert response.status_code == 404, (
@@ -165,45 +165,7 @@ async def test_export_meeting_stage_not_exists():
 
 @pytest.mark.contract
 @pytest.mark.asyncio
-async def test_export_content_type():
-    """
-    Test Content-Type header validation for successful export.
-
-    Verifies:
-    - Response Content-Type header is exactly text/markdown
-    - Content-Type is consistent across different stage parameters
-    """
-    meeting_id = str(uuid.uuid4())
-    stages = ["draft", "review", "final"]
-
-    async with AsyncClient(base_url=BASE_URL) as client:
-        for stage in stages:
-            response = await client.get(
-                f"{API_PREFIX}/meetings/{meeting_id}/export",
-                params={"stage": stage}
-            )
-
-            # Skip if meeting/stage doesn't exist
-            if response.status_code == 404:
-                continue
-
-            # Verify Content-Type for successful responses
-            if response.status_code == 200:
-                content_type = response.headers.get("content-type", "")
-                assert "text/markdown" in content_type, (
-                    f"Stage '{stage}': Expected Content-Type to contain 'text/markdown', "
-                    f"got '{content_type}'"
-                )
-
-                # Verify charset is specified
-                assert "charset" in content_type.lower() or "utf-8" in content_type.lower() or True, (
-                    f"Stage '{stage}': Content-Type should specify charset"
-                )
-
-
-@pytest.mark.contract
-@pytest.mark.asyncio
-async def test_export_all_stage_values():
+async def test_export_all_stage_values(client):
     """
     Test export with all valid stage parameter values.
 
@@ -211,65 +173,29 @@ async def test_export_all_stage_values():
     - All enum values from OpenAPI spec (draft, review, final) are accepted
     - Invalid stage values are rejected with appropriate error
     """
-    meeting_id = str(uuid.uuid4())
+    meeting_id = SAMPLE_MEETING_ID
 
     # Test valid stage values
     valid_stages = ["draft", "review", "final"]
 
-    async with AsyncClient(base_url=BASE_URL) as client:
-        for stage in valid_stages:
-            response = await client.get(
-                f"{API_PREFIX}/meetings/{meeting_id}/export",
-                params={"stage": stage}
-            )
-
-            # Should return either 200 (success) or 404 (not found), not 400 (bad request)
-            assert response.status_code in [200, 404], (
-                f"Valid stage '{stage}' should not return {response.status_code}"
-            )
-
-        # Test invalid stage value
-        response = await client.get(
-            f"{API_PREFIX}/meetings/{meeting_id}/export",
-            params={"stage": "invalid_stage"}
-        )
-
-        # Should return 400 Bad Request for invalid enum value
-        assert response.status_code == 400, (
-            f"Invalid stage value should return 400, got {response.status_code}"
-        )
-
-
-@pytest.mark.contract
-@pytest.mark.asyncio
-async def test_export_meeting_review_stage():
-    """
-    Test exporting meeting in review stage.
+    responses = await asyncio.gather(*[
+        client.get(f"{API_PREFIX}/meetings/{meeting_id}/export", params={"stage": stage})
+        for stage in valid_stages
+    ])
 
-    Verifies:
-    - GET /api/v1/meetings/{meeting_id}/export?stage=review returns 200
-    - Stage parameter correctly filters to review version
-    - Response Content-Type is text/markdown
-    """
-    meeting_id = str(uuid.uuid4())
-
-    async with AsyncClient(base_url=BASE_URL) as client:
-        response = await client.get(
-            f"{API_PREFIX}/meetings/{meeting_id}/export",
-            params={"stage": "review"}
+    for stage, response in zip(valid_stages, responses, strict=True):
+        # Should return either 200 (success) or 404 (not found), not 400 (bad request)
+        assert response.status_code in [200, 404], (
+            f"Valid stage '{stage}' should not return {response.status_code}"
         )
 
-    # Should return 200 or 404, depending on whether stage exists
-    assert response.status_code in [200, 404], (
-        f"Expected status 200 or 404, got {response.status_code}"
+    # Test invalid stage value
+    response = await client.get(
+        f"{API_PREFIX}/meetings/{meeting_id}/export",
+        params={"stage": "invalid_stage"}
     )
 
-    # If successful, verify Content-Type
-    if response.status_code == 200:
-        content_type = response.headers.get("content-type", "")
-        assert "text/markdown" in content_type, (
-            f"Expected Content-Type to contain 'text/markdown', got '{content_type}'"
-        )
-
-        content = response.text
-        assert len(content) > 0, "Response body should not be empty"
+    # Should return 400 Bad Request for invalid enum value
+    assert response.status_code == 400, (
+        f"Invalid stage value should return 400, got {response.status_code}"
+    )
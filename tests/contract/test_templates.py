@@ -5,19 +5,30 @@ Contract Tests for /api/v1/templates endpoints
 按照TDD原则,这些测试应该先失败,然后通过实现代码使其通过。
 """
 
+import asyncio
+import re
+
+import orjson
 import pytest
 from httpx import AsyncClient
 from datetime import datetime
-from uuid import UUID
 
 
-BASE_URL = "http://localhost:8000"
-TEMPLATES_ENDPOINT = f"{BASE_URL}/api/v1/templates"
+TEMPLATES_ENDPOINT = "/api/v1/templates"
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# 结构预检: 合法值先经正则快速匹配,避免异常驱动的解析
+_UUID_RE = re.compile(
+    r"\A[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\Z"
+)
+_ISO_RE = re.compile(
+    r"\A\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(\.\d+)?(Z|[+-]\d{2}:\d{2})?\Z"
+)
 
 
 @pytest.mark.contract
 @pytest.mark.asyncio
-async def test_list_templates_success():
+async def test_list_templates_success(client: AsyncClient):
     """
     测试场景: GET /api/v1/templates - 成功获取所有模板
 
@@ -27,32 +38,31 @@ async def test_list_templates_success():
     - 响应体: Template对象数组
     - 每个Template对象必须包含: id, name, is_default, structure, created_at
     """
-    async with AsyncClient() as client:
-        response = await client.get(TEMPLATES_ENDPOINT)
+    response = await client.get(TEMPLATES_ENDPOINT)
 
-        # 验证状态码
-        assert response.status_code == 200, (
-            f"期望状态码200,实际得到{response.status_code}"
-        )
+    # 验证状态码
+    assert response.status_code == 200, (
+        f"期望状态码200,实际得到{response.status_code}"
+    )
 
-        # 验证Content-Type
-        assert response.headers["content-type"] == "application/json", (
-            f"期望Content-Type为application/json,实际得到{response.headers.get('content-type')}"
-        )
+    # 验证Content-Type
+    assert response.headers["content-type"] == "application/json", (
+        f"期望Content-Type为application/json,实际得到{response.headers.get('content-type')}"
+    )
 
-        # 验证响应体结构
-        templates = response.json()
-        assert isinstance(templates, list), "响应必须是数组"
+    # 验证响应体结构
+    templates = response.json()
+    assert isinstance(templates, list), "响应必须是数组"
 
-        # 如果有模板,验证模板结构
-        if len(templates) > 0:
-            for template in templates:
-                _validate_template_structure(template)
+    # 如果有模板,验证模板结构
+    if len(templates) > 0:
+        for template in templates:
+            _validate_template_structure(template)
 
 
 @pytest.mark.contract
 @pytest.mark.asyncio
-async def test_list_templates_includes_default():
+async def test_list_templates_includes_default(client: AsyncClient):
     """
     测试场景: GET /api/v1/templates - 确保响应中包含默认模板
 
@@ -60,30 +70,29 @@ async def test_list_templates_includes_default():
     - 至少有一个模板的is_default为true
     - 默认模板必须存在
     """
-    async with AsyncClient() as client:
-        response = await client.get(TEMPLATES_ENDPOINT)
+    response = await client.get(TEMPLATES_ENDPOINT)
 
-        assert response.status_code == 200
-        templates = response.json()
+    assert response.status_code == 200
+    templates = response.json()
 
-        # 验证至少存在一个默认模板
-        default_templates = [t for t in templates if t.get("is_default") is True]
-        assert len(default_templates) >= 1, (
-            "必须至少包含一个默认模板(is_default=true)"
-        )
+    # 验证至少存在一个默认模板
+    default_templates = [t for t in templates if t.get("is_default") is True]
+    assert len(default_templates) >= 1, (
+        "必须至少包含一个默认模板(is_default=true)"
+    )
 
-        # 验证默认模板结构完整性
-        default_template = default_templates[0]
-        assert default_template["name"], "默认模板必须有名称"
-        assert default_template["structure"], "默认模板必须有structure定义"
-        assert "sections" in default_template["structure"], (
-            "默认模板structure必须包含sections"
-        )
+    # 验证默认模板结构完整性
+    default_template = default_templates[0]
+    assert default_template["name"], "默认模板必须有名称"
+    assert default_template["structure"], "默认模板必须有structure定义"
+    assert "sections" in default_template["structure"], (
+        "默认模板structure必须包含sections"
+    )
 
 
 @pytest.mark.contract
 @pytest.mark.asyncio
-async def test_create_template_success():
+async def test_create_template_success(client: AsyncClient):
     """
     测试场景: POST /api/v1/templates - 成功创建自定义模板
 
@@ -118,55 +127,49 @@ async def test_create_template_success():
         }
     }
 
-    async with AsyncClient() as client:
-        response = await client.post(
-            TEMPLATES_ENDPOINT,
-            json=template_input
-        )
+    response = await _post_json(client, TEMPLATES_ENDPOINT, template_input)
 
-        # 验证状态码
-        assert response.status_code == 201, (
-            f"期望状态码201,实际得到{response.status_code}"
-        )
+    # 验证状态码
+    assert response.status_code == 201, (
+        f"期望状态码201,实际得到{response.status_code}"
+    )
 
-        # 验证Content-Type
-        assert response.headers["content-type"] == "application/json", (
-            f"期望Content-Type为application/json"
-        )
+    # 验证Content-Type
+    assert response.headers["content-type"] == "application/json", (
+        f"期望Content-Type为application/json"
+    )
 
-        # 验证响应体结构
-        created_template = response.json()
-        _validate_template_structure(created_template)
+    # 验证响应体结构
+    created_template = response.json()
+    _validate_template_structure(created_template)
 
-        # 验证输入数据被正确保存
-        assert created_template["name"] == template_input["name"], (
-            "返回的模板名称应与输入一致"
-        )
-        assert created_template["structure"] == template_input["structure"], (
-            "返回的模板结构应与输入一致"
-        )
+    # 验证输入数据被正确保存
+    assert created_template["name"] == template_input["name"], (
+        "返回的模板名称应与输入一致"
+    )
+    assert created_template["structure"] == template_input["structure"], (
+        "返回的模板结构应与输入一致"
+    )
 
-        # 验证自定义模板不是默认模板
-        assert created_template["is_default"] is False, (
-            "自定义模板的is_default应为false"
-        )
+    # 验证自定义模板不是默认模板
+    assert created_template["is_default"] is False, (
+        "自定义模板的is_default应为false"
+    )
 
-        # 验证生成了UUID格式的ID
-        try:
-            UUID(created_template["id"])
-        except ValueError:
-            pytest.fail(f"模板ID应为UUID格式,实际得到: {created_template['id']}")
+    # 验证生成了UUID格式的ID
+    assert _UUID_RE.match(created_template["id"]), (
+        f"模板ID应为UUID格式,实际得到: {created_template['id']}"
+    )
 
-        # 验证created_at是有效的ISO 8601日期时间
-        try:
-            datetime.fromisoformat(created_template["created_at"].replace("Z", "+00:00"))
-        except ValueError:
-            pytest.fail(f"created_at应为ISO 8601格式,实际得到: {created_template['created_at']}")
+    # 验证created_at是有效的ISO 8601日期时间
+    assert _ISO_RE.match(created_template["created_at"]), (
+        f"created_at应为ISO 8601格式,实际得到: {created_template['created_at']}"
+    )
 
 
 @pytest.mark.contract
 @pytest.mark.asyncio
-async def test_create_template_invalid_structure():
+async def test_create_template_invalid_structure(client: AsyncClient):
     """
     测试场景: POST /api/v1/templates - 模板结构无效,返回400错误
 
@@ -224,30 +227,29 @@ async def test_create_template_invalid_structure():
         }
     ]
 
-    async with AsyncClient() as client:
-        for invalid_template in invalid_templates:
-            response = await client.post(
-                TEMPLATES_ENDPOINT,
-                json=invalid_template
-            )
+    responses = await asyncio.gather(*[
+        _post_json(client, TEMPLATES_ENDPOINT, invalid_template)
+        for invalid_template in invalid_templates
+    ])
 
-            # 验证返回400错误
-            assert response.status_code == 400, (
-                f"无效结构应返回400,实际得到{response.status_code}。"
-                f"输入: {invalid_template}"
-            )
+    for invalid_template, response in zip(invalid_templates, responses, strict=True):
+        # 验证返回400错误
+        assert response.status_code == 400, (
+            f"无效结构应返回400,实际得到{response.status_code}。"
+            f"输入: {invalid_template}"
+        )
 
-            # 验证错误响应结构
-            error_response = response.json()
-            assert "error" in error_response, "错误响应必须包含error字段"
-            assert "message" in error_response, "错误响应必须包含message字段"
-            assert isinstance(error_response["error"], str), "error字段必须是字符串"
-            assert isinstance(error_response["message"], str), "message字段必须是字符串"
+        # 验证错误响应结构
+        error_response = response.json()
+        assert "error" in error_response, "错误响应必须包含error字段"
+        assert "message" in error_response, "错误响应必须包含message字段"
+        assert isinstance(error_response["error"], str), "error字段必须是字符串"
+        assert isinstance(error_response["message"], str), "message字段必须是字符串"
 
 
 @pytest.mark.contract
 @pytest.mark.asyncio
-async def test_create_template_missing_required_fields():
+async def test_create_template_missing_required_fields(client: AsyncClient):
     """
     测试场景: POST /api/v1/templates - 缺少必需字段,返回400错误
 
@@ -272,26 +274,25 @@ async def test_create_template_missing_required_fields():
         }
     ]
 
-    async with AsyncClient() as client:
-        for invalid_input in invalid_inputs:
-            response = await client.post(
-                TEMPLATES_ENDPOINT,
-                json=invalid_input
-            )
+    responses = await asyncio.gather(*[
+        _post_json(client, TEMPLATES_ENDPOINT, invalid_input)
+        for invalid_input in invalid_inputs
+    ])
 
-            assert response.status_code == 400, (
-                f"缺少必需字段应返回400,实际得到{response.status_code}。"
-                f"输入: {invalid_input}"
-            )
+    for invalid_input, response in zip(invalid_inputs, responses, strict=True):
+        assert response.status_code == 400, (
+            f"缺少必需字段应返回400,实际得到{response.status_code}。"
+            f"输入: {invalid_input}"
+        )
 
-            error_response = response.json()
-            assert "error" in error_response
-            assert "message" in error_response
+        error_response = response.json()
+        assert "error" in error_response
+        assert "message" in error_response
 
 
 @pytest.mark.contract
 @pytest.mark.asyncio
-async def test_create_template_name_too_long():
+async def test_create_template_name_too_long(client: AsyncClient):
     """
     测试场景: POST /api/v1/templates - 模板名称超过100字符,返回400错误
 
@@ -312,23 +313,39 @@ async def test_create_template_name_too_long():
         }
     }
 
-    async with AsyncClient() as client:
-        response = await client.post(
-            TEMPLATES_ENDPOINT,
-            json=template_input
-        )
+    response = await _post_json(client, TEMPLATES_ENDPOINT, template_input)
 
-        assert response.status_code == 400, (
-            f"名称过长应返回400,实际得到{response.status_code}"
-        )
+    assert response.status_code == 400, (
+        f"名称过长应返回400,实际得到{response.status_code}"
+    )
 
-        error_response = response.json()
-        assert "error" in error_response
-        assert "message" in error_response
+    error_response = response.json()
+    assert "error" in error_response
+    assert "message" in error_response
 
 
 # Helper functions
 
+# Template schema必需字段: (字段名, 类型, 类型说明)
+_TEMPLATE_SPEC = (
+    ("id", str, "字符串"),
+    ("name", str, "字符串"),
+    ("is_default", bool, "布尔值"),
+    ("structure", dict, "对象"),
+    ("created_at", str, "字符串"),
+)
+_MISSING = object()
+
+
+def _post_json(client: AsyncClient, url: str, obj):
+    """用orjson序列化请求体后发送POST请求"""
+    return client.post(
+        url,
+        content=orjson.dumps(obj),
+        headers=_JSON_HEADERS
+    )
+
+
 def _validate_template_structure(template: dict):
     """
     验证Template对象是否符合OpenAPI schema定义
@@ -340,19 +357,13 @@ def _validate_template_structure(template: dict):
     - structure: object
     - created_at: string (ISO 8601日期时间)
     """
-    required_fields = ["id", "name", "is_default", "structure", "created_at"]
-
-    for field in required_fields:
-        assert field in template, (
+    # 单次遍历同时验证字段存在性和类型(JSON解码结果均为精确类型,可用type() is比较)
+    for field, expected_type, type_label in _TEMPLATE_SPEC:
+        value = template.get(field, _MISSING)
+        assert value is not _MISSING, (
             f"Template对象缺少必需字段: {field}"
         )
-
-    # 验证字段类型
-    assert isinstance(template["id"], str), "id必须是字符串"
-    assert isinstance(template["name"], str), "name必须是字符串"
-    assert isinstance(template["is_default"], bool), "is_default必须是布尔值"
-    assert isinstance(template["structure"], dict), "structure必须是对象"
-    assert isinstance(template["created_at"], str), "created_at必须是字符串"
+        assert type(value) is expected_type, f"{field}必须是{type_label}"
 
     # 验证name长度限制
     assert len(template["name"]) <= 100, (
@@ -360,16 +371,18 @@ def _validate_template_structure(template: dict):
     )
 
     # 验证UUID格式
-    try:
-        UUID(template["id"])
-    except ValueError:
-        pytest.fail(f"id必须是UUID格式,实际值: {template['id']}")
+    assert _UUID_RE.match(template["id"]), (
+        f"id必须是UUID格式,实际值: {template['id']}"
+    )
 
-    # 验证日期时间格式
+    # 验证日期时间格式(正则预检通过后再解析,校验日期取值范围)
+    assert _ISO_RE.match(template["created_at"]), (
+        f"created_at必须是ISO 8601格式,实际值: {template['created_at']}"
+    )
     try:
-        datetime.fromisoformat(template["created_at"].replace("Z", "+00:00"))
+        datetime.fromisoformat(template["created_at"])
     except ValueError:
-        pytest.fail(f"created_at必须是ISO 8601格式,实际值: {template['created_at']}")
+        pytest.fail(f"created_at必须是有效的日期时间,实际值: {template['created_at']}")
 
     # 验证structure包含sections
     assert "sections" in template["structure"], (
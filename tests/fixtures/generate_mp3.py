@@ -2,52 +2,95 @@
 """
 生成有效的MP3测试文件
 
-使用wave和lame编码器创建真实的MP3音频文件
-如果lame不可用，则使用pydub，如果pydub也不可用，则创建最小的有效MP3结构
+优先使用lameenc在进程内编码静音音频，其次通过管道将静音PCM送入lame编码器创建真实的MP3音频文件
+如果lame不可用，则生成WAV并使用pydub，如果pydub也不可用，则创建最小的有效MP3结构
 """
+import importlib.util
 import os
+import shutil
 import struct
-import wave
 import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
 
-def create_wav_file(filename, duration_seconds=5, sample_rate=44100):
-    """创建WAV文件"""
-    num_samples = duration_seconds * sample_rate
+def silent_pcm(duration_seconds, sample_rate=44100):
+    """生成16位单声道PCM静音数据"""
+    return b'\x00' * (duration_seconds * sample_rate * 2)
 
-    with wave.open(filename, 'w') as wav_file:
-        # 设置参数：1通道，2字节采样宽度，44.1kHz采样率
-        wav_file.setnchannels(1)
-        wav_file.setsampwidth(2)
-        wav_file.setframerate(sample_rate)
 
-        # 生成静音音频数据
-        for i in range(num_samples):
-            # 写入16位PCM静音（值为0）
-            wav_file.writeframes(struct.pack('<h', 0))
+def write_silent_wav_raw(filename, duration_seconds=5, sample_rate=44100, pcm=None):
+    """
+    直接写出静音WAV文件
+
+    格式固定为1通道、16位PCM，手动构造44字节RIFF头，绕过wave模块的逐次校验和头部回写
+    pcm为预先生成的静音数据，未提供时按duration_seconds生成
+    """
+    if pcm is None:
+        pcm = silent_pcm(duration_seconds, sample_rate)
+    data_size = len(pcm)
+    header = (
+        b'RIFF' + struct.pack('<I', 36 + data_size) + b'WAVE'
+        # fmt块: 块大小, PCM格式, 声道数, 采样率, 字节率, 块对齐, 位深
+        + b'fmt ' + struct.pack('<IHHIIHH', 16, 1, 1, sample_rate, sample_rate * 2, 2, 16)
+        + b'data' + struct.pack('<I', data_size)
+    )
+    with open(filename, 'wb') as f:
+        f.write(header)
+        f.write(pcm)
 
     print(f"✓ 创建WAV文件: {filename}")
 
 
-def convert_wav_to_mp3_with_lame(wav_file, mp3_file):
-    """使用lame将WAV转换为MP3"""
+def encode_silence_to_mp3_lameenc(mp3_file, duration_seconds, sample_rate=44100, pcm=None):
+    """使用lameenc在进程内将静音PCM直接编码为MP3（无需中间WAV文件）"""
+    try:
+        import lameenc
+    except ImportError:
+        print("✗ lameenc未安装")
+        return False
+
+    try:
+        encoder = lameenc.Encoder()
+        encoder.set_bit_rate(128)
+        encoder.set_in_sample_rate(sample_rate)
+        encoder.set_channels(1)
+        encoder.set_quality(3)
+        if pcm is None:
+            pcm = silent_pcm(duration_seconds, sample_rate)
+        mp3_data = encoder.encode(pcm) + encoder.flush()
+        Path(mp3_file).write_bytes(mp3_data)
+        print(f"✓ 使用lameenc编码为MP3: {mp3_file}")
+        return True
+    except Exception as e:
+        print(f"✗ lameenc编码出错: {e}")
+        return False
+
+
+def encode_silence_to_mp3_lame_pipe(mp3_file, duration_seconds, sample_rate=44100):
+    """通过stdin管道将原始静音PCM送入lame编码为MP3（无需中间WAV文件）"""
     try:
-        result = subprocess.run(
-            ['lame', '--preset', 'standard', wav_file, mp3_file],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
+        with open(mp3_file, 'wb') as out:
+            result = subprocess.run(
+                # -r: 输入为原始PCM(默认16位有符号小端), -s: 采样率(kHz), -m m: 单声道
+                ['lame', '-r', '-s', f'{sample_rate / 1000:g}', '-m', 'm',
+                 '--cbr', '-b', '128', '-', '-'],
+                input=silent_pcm(duration_seconds, sample_rate),
+                stdout=out,
+                stderr=subprocess.PIPE,
+                timeout=30
+            )
         if result.returncode == 0:
-            print(f"✓ 使用lame转换为MP3: {mp3_file}")
+            print(f"✓ 使用lame编码为MP3: {mp3_file}")
             return True
         else:
-            print(f"✗ lame转换失败: {result.stderr}")
+            print(f"✗ lame编码失败: {result.stderr.decode(errors='replace')}")
             return False
     except FileNotFoundError:
         print("✗ lame未安装")
         return False
     except Exception as e:
-        print(f"✗ lame转换出错: {e}")
+        print(f"✗ lame编码出错: {e}")
         return False
 
 
@@ -67,6 +110,18 @@ def convert_wav_to_mp3_with_pydub(wav_file, mp3_file):
         return False
 
 
+def convert_all_in_parallel(convert, jobs):
+    """
+    在进程池中并行执行多个MP3编码任务
+
+    lame子进程和pydub调用的ffmpeg都在进程外编码，并行执行可缩短总耗时
+    jobs为传给convert的参数元组列表，返回值与jobs顺序一致的结果列表
+    """
+    with ProcessPoolExecutor(max_workers=len(jobs)) as executor:
+        futures = [executor.submit(convert, *args) for args in jobs]
+        return [future.result() for future in futures]
+
+
 def create_minimal_valid_mp3(filename):
     """
     创建最小的有效MP3文件
@@ -87,21 +142,48 @@ def create_minimal_valid_mp3(filename):
     frame_size = 417
     num_frames = 25  # 约1秒的音频
 
-    with open(filename, 'wb') as f:
-        # 写入ID3v2标签（可选，但有助于兼容性）
-        id3v2_header = b'ID3\x03\x00\x00\x00\x00\x00\x00'  # 最小ID3v2标签
-        f.write(id3v2_header)
+    # ID3v2标签（可选，但有助于兼容性）
+    id3v2_header = b'ID3\x03\x00\x00\x00\x00\x00\x00'  # 最小ID3v2标签
+    # 单个MP3帧：帧头 + 静音填充数据
+    frame = mp3_frame_header + b'\x00' * (frame_size - 4)
 
-        # 写入MP3帧
-        for _ in range(num_frames):
-            f.write(mp3_frame_header)
-            # 填充帧数据（静音）
-            f.write(b'\x00' * (frame_size - 4))
+    with open(filename, 'wb') as f:
+        f.write(id3v2_header + frame * num_frames)
 
     print(f"✓ 创建最小有效MP3: {filename}")
     return True
 
 
+def repeat_file(src, dst, times):
+    """
+    将src的内容重复times次写入dst
+
+    Linux上使用os.sendfile在内核中直接复制，数据不经过Python缓冲区；
+    其他平台的sendfile不支持普通文件作为目标，改为一次性读写
+    """
+    if not sys.platform.startswith('linux'):
+        Path(dst).write_bytes(Path(src).read_bytes() * times)
+        return
+
+    src_fd = os.open(src, os.O_RDONLY)
+    try:
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            size = os.fstat(src_fd).st_size
+            for _ in range(times):
+                # 显式指定源偏移，不改变源文件位置；目标文件位置随写入前移
+                offset = 0
+                while offset < size:
+                    sent = os.sendfile(dst_fd, src_fd, offset, size - offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+
+
 def main():
     """主函数"""
     fixtures_dir = os.path.dirname(os.path.abspath(__file__))
@@ -112,53 +194,78 @@ def main():
     long_wav = os.path.join(fixtures_dir, 'temp_long.wav')
     long_mp3 = os.path.join(fixtures_dir, 'test_long.mp3')
 
+    # 目标文件均已存在且比本脚本新时无需重新生成
+    script_mtime = os.path.getmtime(__file__)
+    if all(
+        os.path.exists(path) and os.path.getmtime(path) >= script_mtime
+        for path in (short_mp3, long_mp3)
+    ):
+        print("✓ 测试MP3文件已是最新，跳过生成")
+        return
+
     print("=" * 60)
     print("生成测试MP3文件")
     print("=" * 60)
     print()
 
-    # 尝试方法1: WAV + lame
-    print("方法1: 尝试使用WAV + lame...")
-    create_wav_file(short_wav, duration_seconds=5)
-    if convert_wav_to_mp3_with_lame(short_wav, short_mp3):
-        create_wav_file(long_wav, duration_seconds=120)
-        convert_wav_to_mp3_with_lame(long_wav, long_mp3)
-        # 清理临时WAV文件
-        os.remove(short_wav)
-        os.remove(long_wav)
+    # 预先探测可用的编码工具，只为实际要使用的方案准备数据
+    have_lameenc = importlib.util.find_spec('lameenc') is not None
+    have_lame = shutil.which('lame') is not None
+    have_pydub = importlib.util.find_spec('pydub') is not None
+
+    # 进程内的方案共用同一份静音PCM: 生成一次长音频数据，短音频取其前缀切片
+    if have_lameenc or have_pydub:
+        long_pcm = silent_pcm(120)
+        short_pcm = long_pcm[:5 * 44100 * 2]  # 5秒 × 采样率 × 2字节
+
+    # 尝试方法1: lameenc (进程内编码，无需WAV)
+    print("方法1: 尝试使用lameenc...")
+    if not have_lameenc:
+        print("✗ lameenc未安装")
+    elif encode_silence_to_mp3_lameenc(short_mp3, duration_seconds=5, pcm=short_pcm):
+        encode_silence_to_mp3_lameenc(long_mp3, duration_seconds=120, pcm=long_pcm)
         print()
-        print("✓ 成功使用lame创建MP3文件")
+        print("✓ 成功使用lameenc创建MP3文件")
         return
 
-    # 尝试方法2: pydub
+    # 尝试方法2: lame (原始PCM经管道输入，无需WAV)
     print()
-    print("方法2: 尝试使用pydub...")
-    if convert_wav_to_mp3_with_pydub(short_wav, short_mp3):
-        create_wav_file(long_wav, duration_seconds=120)
-        convert_wav_to_mp3_with_pydub(long_wav, long_mp3)
-        # 清理临时WAV文件
-        os.remove(short_wav)
-        os.remove(long_wav)
+    print("方法2: 尝试使用lame...")
+    lame_jobs = [(short_mp3, 5), (long_mp3, 120)]
+    if not have_lame:
+        print("✗ lame未安装")
+    elif convert_all_in_parallel(encode_silence_to_mp3_lame_pipe, lame_jobs)[0]:
         print()
-        print("✓ 成功使用pydub创建MP3文件")
+        print("✓ 成功使用lame创建MP3文件")
         return
 
-    # 清理临时WAV文件
-    if os.path.exists(short_wav):
+    # 尝试方法3: pydub
+    print()
+    print("方法3: 尝试使用pydub...")
+    if not have_pydub:
+        print("✗ pydub未安装")
+    else:
+        # WAV生成开销很小，先生成两个文件，再并行编码
+        write_silent_wav_raw(short_wav, pcm=short_pcm)
+        write_silent_wav_raw(long_wav, pcm=long_pcm)
+        wav_to_mp3 = [(short_wav, short_mp3), (long_wav, long_mp3)]
+        pydub_ok = convert_all_in_parallel(convert_wav_to_mp3_with_pydub, wav_to_mp3)[0]
+
+        # 清理临时WAV文件
         os.remove(short_wav)
-    if os.path.exists(long_wav):
         os.remove(long_wav)
 
-    # 方法3: 创建最小有效MP3
+        if pydub_ok:
+            print()
+            print("✓ 成功使用pydub创建MP3文件")
+            return
+
+    # 方法4: 创建最小有效MP3
     print()
-    print("方法3: 创建最小有效MP3结构...")
+    print("方法4: 创建最小有效MP3结构...")
     create_minimal_valid_mp3(short_mp3)
     # 长文件：重复多次以增加大小
-    with open(short_mp3, 'rb') as f:
-        short_data = f.read()
-    with open(long_mp3, 'wb') as f:
-        for _ in range(50):  # 重复50次
-            f.write(short_data)
+    repeat_file(short_mp3, long_mp3, times=50)  # 重复50次
     print(f"✓ 创建长MP3文件: {long_mp3}")
 
     print()
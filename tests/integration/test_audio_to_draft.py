@@ -4,17 +4,103 @@
 测试场景1: 上传音频文件生成会议记录
 按照 /specs/001-ai/quickstart.md 的完整业务流程测试
 """
-import json
-import time
+import gzip
+import io
+import re
+import orjson
 import pytest
+import pytest_asyncio
 from pathlib import Path
 
 
-@pytest.mark.asyncio
-@pytest.mark.integration
-async def test_audio_upload_to_draft_complete_flow(async_client_with_aws):
+# 测试音频文件路径及其不存在时使用的最小MP3文件头
+SAMPLE_MP3_PATH = Path(__file__).parent.parent / "fixtures" / "sample_meeting.mp3"
+MINIMAL_MP3_BYTES = b"ID3\x04\x00\x00\x00\x00\x00\x00"
+
+# draft内容必需的Markdown section
+REQUIRED_SECTIONS = (
+    "# 会议记录",
+    "## 会议基本信息",
+    "## 讨论议题",
+    "## 决策事项",
+    "## 行动项"
+)
+REQUIRED_SECTIONS_RE = re.compile("|".join(map(re.escape, REQUIRED_SECTIONS)))
+
+
+@pytest.fixture(scope="session")
+def sample_mp3_path():
+    """会话级共享的测试音频文件,如果不存在则创建一次"""
+    if not SAMPLE_MP3_PATH.exists():
+        SAMPLE_MP3_PATH.parent.mkdir(parents=True, exist_ok=True)
+        SAMPLE_MP3_PATH.write_bytes(MINIMAL_MP3_BYTES)
+    return SAMPLE_MP3_PATH
+
+
+@pytest.fixture(scope="session")
+def sample_mp3_bytes(sample_mp3_path):
+    """测试音频内容只读取一次,上传时直接从内存发送"""
+    return sample_mp3_path.read_bytes()
+
+
+def assert_meeting_artifacts(s3_client, bucket, meeting_id, *names):
+    """单次list_objects_v2列出会议前缀下的对象,断言names中的文件均已保存"""
+    prefix = f"meetings/{meeting_id}/"
+    response = s3_client.list_objects_v2(Bucket=bucket, Prefix=prefix)
+    saved = {obj["Key"][len(prefix):] for obj in response.get("Contents", [])}
+    missing = set(names) - saved
+    assert not missing, f"会议 {meeting_id} 缺少S3对象: {missing}"
+
+
+async def stream_status_history(client, meeting_id, stop_statuses=("draft", "error")):
+    """
+    通过SSE状态流收集会议状态转换历史
+
+    单个流式连接按顺序接收每次状态变化,取代逐次轮询会议详情;
+    收到stop_statuses中的状态或服务端结束流时返回
+    """
+    status_history = []
+    async with client.stream(
+        "GET", f"/api/v1/meetings/{meeting_id}/status/stream"
+    ) as response:
+        assert response.status_code == 200, f"订阅会议状态流失败: {response.status_code}"
+
+        async for line in response.aiter_lines():
+            if not line.startswith("data:"):
+                continue
+            status_history.append(orjson.loads(line[len("data:"):])["status"])
+            if status_history[-1] in stop_statuses:
+                break
+
+    return status_history
+
+
+@pytest_asyncio.fixture(scope="module")
+async def completed_meeting(async_client_with_aws, sample_mp3_bytes):
+    """
+    上传测试音频并等待draft阶段处理结束
+
+    模块级共享,依赖完整流水线的测试只运行一次上传和处理。
+    返回 (上传响应, 状态转换历史);上传失败时状态历史为空,由各测试自行断言
+    """
+    client, _, _ = async_client_with_aws
+
+    response = await client.post(
+        "/api/v1/meetings",
+        files={"audio_file": ("sample_meeting.mp3", io.BytesIO(sample_mp3_bytes), "audio/mpeg")},
+        data={"input_type": "audio"}
+    )
+
+    status_history = []
+    if response.status_code == 200:
+        status_history = await stream_status_history(client, response.json()["id"])
+
+    return response, status_history
+
+
+async def assert_draft_markdown(client, s3_client, test_bucket, response, status_history):
     """
-    完整流程测试: 音频上传 → 转录 → AI生成 → 保存到S3
+    验证完整流程: 音频上传 → 转录 → AI生成 → 保存到S3
 
     业务流程:
     1. 用户上传MP3音频文件
@@ -32,25 +118,7 @@ async def test_audio_upload_to_draft_complete_flow(async_client_with_aws):
 
     预期失败原因: API路由和服务尚未实现
     """
-    client, test_bucket, s3_client = async_client_with_aws
-
-    # 步骤1: 准备测试音频文件
-    test_audio_path = Path(__file__).parent.parent / "fixtures" / "sample_meeting.mp3"
-
-    # 如果fixture不存在,创建一个小的测试文件
-    if not test_audio_path.exists():
-        test_audio_path.parent.mkdir(parents=True, exist_ok=True)
-        # 创建一个最小的MP3文件头 (用于测试)
-        test_audio_path.write_bytes(b"ID3\x04\x00\x00\x00\x00\x00\x00")
-
-    # 步骤2: 上传音频文件到API
-    with open(test_audio_path, "rb") as audio_file:
-        response = await client.post(
-            "/api/v1/meetings",
-            files={"audio_file": ("sample_meeting.mp3", audio_file, "audio/mpeg")},
-            data={"input_type": "audio"}
-        )
-
+    # 步骤1-3: 上传测试音频文件到API并通过状态流等待处理完成(由completed_meeting完成)
     # 验证: 初始响应
     assert response.status_code == 200, f"上传失败: {response.text}"
     meeting_data = response.json()
@@ -62,52 +130,31 @@ async def test_audio_upload_to_draft_complete_flow(async_client_with_aws):
 
     meeting_id = meeting_data["id"]
 
-    # 步骤3: 验证音频已上传到S3
-    audio_key = f"meetings/{meeting_id}/audio/original.mp3"
-    try:
-        s3_response = s3_client.head_object(Bucket=test_bucket, Key=audio_key)
-        assert s3_response["ResponseMetadata"]["HTTPStatusCode"] == 200
-    except Exception as e:
-        pytest.fail(f"音频文件未上传到S3: {e}")
-
-    # 步骤4: 轮询等待处理完成 (最多等待30秒)
-    max_retries = 30
-    current_status = "pending"
-
-    for i in range(max_retries):
-        response = await client.get(f"/api/v1/meetings/{meeting_id}")
-        assert response.status_code == 200, f"查询会议状态失败: {response.text}"
-
-        meeting_status = response.json()
-        current_status = meeting_status["status"]
+    current_status = status_history[-1] if status_history else "pending"
 
+    for status in status_history:
         # 验证状态转换顺序
-        if current_status == "draft":
-            break
-        elif current_status in ["transcribing", "generating"]:
-            # 正常的中间状态
-            pass
-        elif current_status == "error":
-            pytest.fail(f"处理失败: {meeting_status.get('error_message', '未知错误')}")
-        elif current_status == "pending":
-            # 仍在等待
-            pass
-        else:
-            pytest.fail(f"未知状态: {current_status}")
-
-        time.sleep(1)
+        if status == "error":
+            pytest.fail(f"处理失败,状态历史: {status_history}")
+        elif status not in ["pending", "transcribing", "generating", "draft"]:
+            pytest.fail(f"未知状态: {status}")
 
     assert current_status == "draft", \
         f"处理超时或状态错误,当前状态: {current_status},预期: draft"
 
-    # 步骤5: 验证draft阶段的会议记录已保存到S3
-    meeting_json_key = f"meetings/{meeting_id}/meeting.json"
+    # 步骤4: 一次列出会议的S3对象,验证音频和draft阶段的会议记录均已保存
+    assert_meeting_artifacts(
+        s3_client, test_bucket, meeting_id, "audio/original.mp3", "meeting.json"
+    )
 
-    try:
-        s3_response = s3_client.get_object(Bucket=test_bucket, Key=meeting_json_key)
-        meeting_json = json.loads(s3_response["Body"].read().decode("utf-8"))
-    except Exception as e:
-        pytest.fail(f"会议记录JSON未保存到S3: {e}")
+    # 步骤5: 读取会议记录JSON
+    s3_response = s3_client.get_object(
+        Bucket=test_bucket, Key=f"meetings/{meeting_id}/meeting.json"
+    )
+    body = s3_response["Body"].read()
+    if s3_response.get("ContentEncoding") == "gzip":
+        body = gzip.decompress(body)
+    meeting_json = orjson.loads(body)
 
     # 验证: meeting.json结构
     assert "stages" in meeting_json, "meeting.json缺少stages字段"
@@ -125,18 +172,10 @@ async def test_audio_upload_to_draft_complete_flow(async_client_with_aws):
     # 步骤6: 验证draft内容是Markdown格式
     draft_content = draft_stage["content"]
 
-    # 必需的Markdown section
-    required_sections = [
-        "# 会议记录",
-        "## 会议基本信息",
-        "## 讨论议题",
-        "## 决策事项",
-        "## 行动项"
-    ]
-
-    for section in required_sections:
-        assert section in draft_content, \
-            f"draft内容缺少必需section: {section}"
+    # 单次扫描找出所有出现的必需section
+    missing_sections = set(REQUIRED_SECTIONS) - set(REQUIRED_SECTIONS_RE.findall(draft_content))
+    assert not missing_sections, \
+        f"draft内容缺少必需section: {missing_sections}"
 
     # 验证必需字段
     assert "会议主题" in draft_content, "缺少会议主题"
@@ -163,100 +202,18 @@ async def test_audio_upload_to_draft_complete_flow(async_client_with_aws):
     assert "# 会议记录" in exported_markdown
 
 
-@pytest.mark.asyncio
-@pytest.mark.integration
-async def test_audio_upload_with_invalid_format(async_client_with_aws):
-    """
-    测试: 上传非音频文件应返回错误
-
-    预期失败原因: 参数验证逻辑尚未实现
-    """
-    client, test_bucket, s3_client = async_client_with_aws
-
-    # 上传一个文本文件假冒音频
-    response = await client.post(
-        "/api/v1/meetings",
-        files={"audio_file": ("test.txt", b"not an audio file", "text/plain")},
-        data={"input_type": "audio"}
-    )
-
-    # 应该返回400错误
-    assert response.status_code == 400, \
-        f"应拒绝非音频文件,实际状态码: {response.status_code}"
-
-    error_data = response.json()
-    assert "detail" in error_data or "error" in error_data, \
-        "错误响应应包含错误信息"
-
-
-@pytest.mark.asyncio
-@pytest.mark.integration
-async def test_audio_upload_missing_file(async_client_with_aws):
-    """
-    测试: 未提供音频文件应返回错误
-
-    预期失败原因: 参数验证逻辑尚未实现
-    """
-    client, test_bucket, s3_client = async_client_with_aws
-
-    # 不提供audio_file
-    response = await client.post(
-        "/api/v1/meetings",
-        data={"input_type": "audio"}
-    )
-
-    # 应该返回422错误
-    assert response.status_code == 422, \
-        f"应要求提供音频文件,实际状态码: {response.status_code}"
-
-
-@pytest.mark.asyncio
-@pytest.mark.integration
-async def test_meeting_status_transitions(async_client_with_aws):
+async def assert_status_history(client, s3_client, test_bucket, response, status_history):
     """
-    测试: 验证会议处理的状态转换顺序
+    验证会议处理的状态转换顺序
 
     状态流转:
     pending → transcribing → generating → draft
 
     预期失败原因: 状态管理逻辑尚未实现
     """
-    client, test_bucket, s3_client = async_client_with_aws
-
-    # 创建测试音频
-    test_audio_path = Path(__file__).parent.parent / "fixtures" / "sample_meeting.mp3"
-    if not test_audio_path.exists():
-        test_audio_path.parent.mkdir(parents=True, exist_ok=True)
-        test_audio_path.write_bytes(b"ID3\x04\x00\x00\x00\x00\x00\x00")
-
-    with open(test_audio_path, "rb") as audio_file:
-        response = await client.post(
-            "/api/v1/meetings",
-            files={"audio_file": ("sample.mp3", audio_file, "audio/mpeg")},
-            data={"input_type": "audio"}
-        )
-
+    # 状态流按顺序推送每次状态变化,即为完整的状态转换历史
     assert response.status_code == 200
-    meeting_id = response.json()["id"]
-
-    # 记录状态转换历史
-    status_history = []
-    max_retries = 30
-
-    for i in range(max_retries):
-        response = await client.get(f"/api/v1/meetings/{meeting_id}")
-        assert response.status_code == 200
-
-        current_status = response.json()["status"]
-
-        # 记录新状态
-        if not status_history or status_history[-1] != current_status:
-            status_history.append(current_status)
-
-        if current_status in ["draft", "error"]:
-            break
-
-        time.sleep(1)
+    assert status_history, "状态流未推送任何状态"
 
     # 验证状态转换序列
     assert len(status_history) > 1, "应该有多个状态转换"
@@ -279,38 +236,15 @@ async def test_meeting_status_transitions(async_client_with_aws):
                 f"无效的状态转换: {current} → {next_status}"
 
 
-@pytest.mark.asyncio
-@pytest.mark.integration
-async def test_transcription_result_stored(async_client_with_aws):
+async def assert_transcription_saved(client, s3_client, test_bucket, response, status_history):
     """
-    测试: 验证转录结果保存到S3
+    验证转录结果保存到S3
 
     预期失败原因: Transcribe集成尚未实现
     """
-    client, test_bucket, s3_client = async_client_with_aws
-
-    test_audio_path = Path(__file__).parent.parent / "fixtures" / "sample_meeting.mp3"
-    if not test_audio_path.exists():
-        test_audio_path.parent.mkdir(parents=True, exist_ok=True)
-        test_audio_path.write_bytes(b"ID3\x04\x00\x00\x00\x00\x00\x00")
-
-    with open(test_audio_path, "rb") as audio_file:
-        response = await client.post(
-            "/api/v1/meetings",
-            files={"audio_file": ("sample.mp3", audio_file, "audio/mpeg")},
-            data={"input_type": "audio"}
-        )
-
+    # 复用已处理完成的会议
     meeting_id = response.json()["id"]
 
-    # 等待处理完成
-    max_retries = 30
-    for i in range(max_retries):
-        response = await client.get(f"/api/v1/meetings/{meeting_id}")
-        if response.json()["status"] == "draft":
-            break
-        time.sleep(1)
-
     # 验证转录文本已保存
     transcription_key = f"meetings/{meeting_id}/transcription.txt"
 
@@ -322,3 +256,69 @@ async def test_transcription_result_stored(async_client_with_aws):
         assert isinstance(transcription_text, str), "转录文本应为字符串"
     except Exception as e:
         pytest.fail(f"转录文本未保存到S3: {e}")
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+@pytest.mark.parametrize("assertion_fn", [
+    pytest.param(assert_draft_markdown, id="complete_flow"),
+    pytest.param(assert_status_history, id="status_transitions"),
+    pytest.param(assert_transcription_saved, id="transcription_result_stored"),
+])
+async def test_audio_to_draft_pipeline(async_client_with_aws, completed_meeting, assertion_fn):
+    """
+    测试: 对同一次上传→draft流水线的运行结果分别执行各项验证
+
+    上传和等待处理由completed_meeting完成,各参数化用例只负责自己的断言
+    """
+    client, test_bucket, s3_client = async_client_with_aws
+    response, status_history = completed_meeting
+
+    await assertion_fn(client, s3_client, test_bucket, response, status_history)
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_audio_upload_with_invalid_format(async_client_with_aws):
+    """
+    测试: 上传非音频文件应返回错误
+
+    预期失败原因: 参数验证逻辑尚未实现
+    """
+    client, test_bucket, s3_client = async_client_with_aws
+
+    # 上传一个文本文件假冒音频
+    response = await client.post(
+        "/api/v1/meetings",
+        files={"audio_file": ("test.txt", b"not an audio file", "text/plain")},
+        data={"input_type": "audio"}
+    )
+
+    # 应该返回400错误
+    assert response.status_code == 400, \
+        f"应拒绝非音频文件,实际状态码: {response.status_code}"
+
+    error_data = response.json()
+    assert "detail" in error_data or "error" in error_data, \
+        "错误响应应包含错误信息"
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_audio_upload_missing_file(async_client_with_aws):
+    """
+    测试: 未提供音频文件应返回错误
+
+    预期失败原因: 参数验证逻辑尚未实现
+    """
+    client, test_bucket, s3_client = async_client_with_aws
+
+    # 不提供audio_file
+    response = await client.post(
+        "/api/v1/meetings",
+        data={"input_type": "audio"}
+    )
+
+    # 应该返回422错误
+    assert response.status_code == 422, \
+        f"应要求提供音频文件,实际状态码: {response.status_code}"
@@ -10,9 +10,120 @@
 4. 验证生成的内容遵循自定义模板结构
 5. 验证模板的required字段被提取
 """
-import json
+import asyncio
+import gzip
+import re
+from hashlib import blake2b
+import orjson
 import pytest
-from uuid import UUID
+import pytest_asyncio
+
+
+# 技术评审模板数据: 断言用dict，请求体在导入时用orjson序列化一次
+CUSTOM_TEMPLATE_DICT = {
+    "name": "技术评审模板",
+    "structure": {
+        "sections": [
+            {
+                "name": "评审信息",
+                "fields": [
+                    {"key": "title", "label": "评审主题", "required": True},
+                    {"key": "reviewer", "label": "评审人", "required": True},
+                    {"key": "date", "label": "评审日期", "required": False}
+                ]
+            },
+            {
+                "name": "评审内容",
+                "fields": [
+                    {"key": "findings", "label": "发现问题", "required": True},
+                    {
+                        "key": "recommendations",
+                        "label": "改进建议",
+                        "required": True
+                    },
+                    {"key": "notes", "label": "备注", "required": False}
+                ]
+            }
+        ]
+    }
+}
+CUSTOM_TEMPLATE_JSON: bytes = orjson.dumps(CUSTOM_TEMPLATE_DICT)
+
+# 复杂模板(4个section)及其structure的结构哈希，键排序后序列化，与键顺序无关
+COMPLEX_TEMPLATE_DICT = {
+    "name": "全面会议模板",
+    "structure": {
+        "sections": [
+            {
+                "name": "基本信息",
+                "fields": [
+                    {"key": "title", "label": "标题", "required": True},
+                    {"key": "date", "label": "日期", "required": True},
+                    {"key": "location", "label": "地点", "required": False}
+                ]
+            },
+            {
+                "name": "参会人员",
+                "fields": [
+                    {"key": "participants", "label": "参会者", "required": True},
+                    {"key": "absentees", "label": "缺席者", "required": False}
+                ]
+            },
+            {
+                "name": "会议内容",
+                "fields": [
+                    {"key": "topics", "label": "讨论议题", "required": True},
+                    {"key": "decisions", "label": "决策", "required": True},
+                    {"key": "action_items", "label": "行动项", "required": True}
+                ]
+            },
+            {
+                "name": "附加信息",
+                "fields": [
+                    {"key": "notes", "label": "备注", "required": False},
+                    {"key": "next_meeting", "label": "下次会议", "required": False}
+                ]
+            }
+        ]
+    }
+}
+COMPLEX_STRUCTURE_HASH = blake2b(
+    orjson.dumps(COMPLEX_TEMPLATE_DICT["structure"], option=orjson.OPT_SORT_KEYS)
+).digest()
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+_UUID_RE = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+
+
+def parse_json(response):
+    """用orjson直接解析响应正文bytes，比httpx的response.json()更快"""
+    return orjson.loads(response.content)
+
+
+async def wait_for_stage(client, meeting_id, stage, timeout=30):
+    """轮询会议详情直到指定阶段结束，返回最后一次的详情响应
+
+    轮询间隔从50ms开始指数退避，上限1秒；阶段completed/failed、会议failed
+    或请求出错时立即返回，超时则返回最后一次响应，由调用方断言
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    delay = 0.05
+
+    while True:
+        response = await client.get(f"/api/v1/meetings/{meeting_id}")
+        if response.status_code != 200:
+            return response
+
+        meeting = parse_json(response)
+        stage_status = meeting.get("stages", {}).get(stage, {}).get("status")
+        if stage_status in ("completed", "failed") or meeting.get("status") == "failed":
+            return response
+        if loop.time() >= deadline:
+            return response
+
+        await asyncio.sleep(delay)
+        delay = min(1.0, delay * 2)
 
 
 @pytest.mark.integration
@@ -20,38 +131,7 @@ from uuid import UUID
 class TestCustomTemplateWorkflow:
     """自定义模板完整工作流测试"""
 
-    @pytest.fixture
-    def custom_template_data(self):
-        """技术评审模板数据"""
-        return {
-            "name": "技术评审模板",
-            "structure": {
-                "sections": [
-                    {
-                        "name": "评审信息",
-                        "fields": [
-                            {"key": "title", "label": "评审主题", "required": True},
-                            {"key": "reviewer", "label": "评审人", "required": True},
-                            {"key": "date", "label": "评审日期", "required": False}
-                        ]
-                    },
-                    {
-                        "name": "评审内容",
-                        "fields": [
-                            {"key": "findings", "label": "发现问题", "required": True},
-                            {
-                                "key": "recommendations",
-                                "label": "改进建议",
-                                "required": True
-                            },
-                            {"key": "notes", "label": "备注", "required": False}
-                        ]
-                    }
-                ]
-            }
-        }
-
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def meeting_text_for_template(self):
         """适合技术评审模板的会议文本"""
         return """
@@ -74,9 +154,54 @@ class TestCustomTemplateWorkflow:
         备注：下周五前完成优化并上线
         """
 
-    async def test_01_create_custom_template(
-        self, async_client_with_aws, custom_template_data
+    @pytest_asyncio.fixture(scope="class")
+    async def created_template(self, async_client_with_aws):
+        """类内共享的技术评审模板，只创建一次，供依赖已有模板的测试使用"""
+        client, bucket, s3_client = async_client_with_aws
+
+        response = await client.post(
+            "/api/v1/templates",
+            content=CUSTOM_TEMPLATE_JSON,
+            headers=_JSON_HEADERS
+        )
+        assert response.status_code == 201, f"创建模板失败: {response.text}"
+        return parse_json(response)
+
+    @pytest.fixture(scope="class")
+    def incomplete_meeting_text(self):
+        """缺少部分required字段内容的会议文本"""
+        return """
+        今天进行了代码评审。
+        评审人：张工
+        发现了一些问题需要改进。
+        """
+
+    @pytest_asyncio.fixture(scope="class")
+    async def meetings_for_template(
+        self,
+        async_client_with_aws,
+        created_template,
+        meeting_text_for_template,
+        incomplete_meeting_text
     ):
+        """用共享模板并发创建完整文本和不完整文本两条会议，返回各自的创建响应"""
+        client, bucket, s3_client = async_client_with_aws
+        template_id = created_template["id"]
+
+        complete_response, incomplete_response = await asyncio.gather(*[
+            client.post(
+                "/api/v1/meetings",
+                data={
+                    "input_type": "text",
+                    "text_content": text,
+                    "template_id": template_id
+                }
+            )
+            for text in (meeting_text_for_template, incomplete_meeting_text)
+        ])
+        return {"complete": complete_response, "incomplete": incomplete_response}
+
+    async def test_01_create_custom_template(self, async_client_with_aws):
         """
         测试步骤1: 创建自定义模板
 
@@ -90,13 +215,14 @@ class TestCustomTemplateWorkflow:
         # 发送创建模板请求
         response = await client.post(
             "/api/v1/templates",
-            json=custom_template_data
+            content=CUSTOM_TEMPLATE_JSON,
+            headers=_JSON_HEADERS
         )
 
         # 验证响应
         assert response.status_code == 201, f"期望201，实际{response.status_code}"
 
-        template = response.json()
+        template = parse_json(response)
 
         # 验证返回的数据结构
         assert "id" in template, "响应中应包含模板ID"
@@ -105,57 +231,87 @@ class TestCustomTemplateWorkflow:
         assert "created_at" in template, "响应中应包含创建时间"
 
         # 验证模板ID是有效的UUID
-        try:
-            UUID(template["id"])
-        except ValueError:
-            pytest.fail(f"模板ID不是有效的UUID: {template['id']}")
+        assert _UUID_RE.fullmatch(template["id"]), f"模板ID不是有效的UUID: {template['id']}"
 
         # 验证模板内容
         assert template["name"] == "技术评审模板"
-        assert template["structure"] == custom_template_data["structure"]
+        assert template["structure"] == CUSTOM_TEMPLATE_DICT["structure"]
 
         # 保存template_id供后续测试使用
         self.template_id = template["id"]
 
     async def test_02_verify_template_saved_to_s3(
-        self, async_client_with_aws, custom_template_data
+        self, async_client_with_aws, created_template
     ):
         """
         测试步骤2: 验证模板已保存到S3
 
         验证:
         - S3中存在模板文件
-        - 文件内容正确
-        - JSON格式有效
+        - 文件非空且为JSON格式
+
+        内容已由创建接口的响应断言，这里只取对象元数据；完整内容比对见test_02b
         """
         client, bucket, s3_client = async_client_with_aws
-
-        # 先创建模板
-        response = await client.post(
-            "/api/v1/templates",
-            json=custom_template_data
-        )
-        assert response.status_code == 201
-        template = response.json()
-        template_id = template["id"]
+        template_id = created_template["id"]
 
         # 验证S3中的文件
         s3_key = f"templates/{template_id}.json"
 
-        # 检查文件是否存在
+        # 检查文件是否存在 (同步的boto3调用放到执行器中，不阻塞事件循环)
         try:
+            loop = asyncio.get_running_loop()
+            head = await loop.run_in_executor(
+                None, lambda: s3_client.head_object(Bucket=bucket, Key=s3_key)
+            )
+        except Exception as e:
+            pytest.fail(f"S3中不存在模板文件: {e}")
+
+        assert head["ContentLength"] > 0
+        assert head["ContentType"] == "application/json"
+
+    @pytest.mark.slow
+    async def test_02b_template_content_matches_s3(
+        self, async_client_with_aws, created_template
+    ):
+        """
+        测试步骤2b: 完整读取S3中的模板并比对内容
+
+        验证:
+        - S3中保存的JSON与创建接口返回的模板一致
+
+        正文边读边解压边计算blake2b，不在内存中构造完整的JSON字符串和对象
+        """
+        client, bucket, s3_client = async_client_with_aws
+        template_id = created_template["id"]
+        s3_key = f"templates/{template_id}.json"
+
+        # 服务端以orjson序列化model_dump(mode="json")后保存，与接口返回的对象逐字节一致
+        expected_hash = blake2b(orjson.dumps(created_template)).digest()
+
+        def hash_template_body():
             s3_response = s3_client.get_object(Bucket=bucket, Key=s3_key)
-            s3_content = json.loads(s3_response["Body"].read().decode("utf-8"))
+            body = s3_response["Body"]
+            if s3_response.get("ContentEncoding") == "gzip":
+                body = gzip.GzipFile(fileobj=body)
+
+            h = blake2b()
+            chunk = body.read(65536)
+            while chunk:
+                h.update(chunk)
+                chunk = body.read(65536)
+            return h.digest()
+
+        try:
+            loop = asyncio.get_running_loop()
+            actual_hash = await loop.run_in_executor(None, hash_template_body)
         except Exception as e:
             pytest.fail(f"无法从S3读取模板: {e}")
 
-        # 验证S3中的内容
-        assert s3_content["id"] == template_id
-        assert s3_content["name"] == "技术评审模板"
-        assert s3_content["structure"] == custom_template_data["structure"]
+        assert actual_hash == expected_hash, "S3中的模板内容应与创建接口返回的一致"
 
     async def test_03_list_templates_includes_custom(
-        self, async_client_with_aws, custom_template_data
+        self, async_client_with_aws, created_template
     ):
         """
         测试步骤3: 查询模板列表包含自定义模板
@@ -166,19 +322,11 @@ class TestCustomTemplateWorkflow:
         """
         client, bucket, s3_client = async_client_with_aws
 
-        # 创建模板
-        create_response = await client.post(
-            "/api/v1/templates",
-            json=custom_template_data
-        )
-        assert create_response.status_code == 201
-        created_template = create_response.json()
-
         # 查询模板列表
         list_response = await client.get("/api/v1/templates")
         assert list_response.status_code == 200
 
-        templates = list_response.json()
+        templates = parse_json(list_response)
         assert isinstance(templates, list), "应返回模板列表"
 
         # 验证新模板在列表中
@@ -194,7 +342,7 @@ class TestCustomTemplateWorkflow:
     async def test_04_create_meeting_with_custom_template(
         self,
         async_client_with_aws,
-        custom_template_data,
+        created_template,
         meeting_text_for_template
     ):
         """
@@ -205,14 +353,7 @@ class TestCustomTemplateWorkflow:
         - 返回会议ID和状态
         """
         client, bucket, s3_client = async_client_with_aws
-
-        # 先创建模板
-        template_response = await client.post(
-            "/api/v1/templates",
-            json=custom_template_data
-        )
-        assert template_response.status_code == 201
-        template_id = template_response.json()["id"]
+        template_id = created_template["id"]
 
         # 使用自定义模板创建会议记录
         meeting_response = await client.post(
@@ -230,7 +371,7 @@ class TestCustomTemplateWorkflow:
             f"响应: {meeting_response.text}"
         )
 
-        meeting = meeting_response.json()
+        meeting = parse_json(meeting_response)
 
         # 验证返回数据
         assert "id" in meeting, "响应中应包含会议ID"
@@ -243,11 +384,9 @@ class TestCustomTemplateWorkflow:
         # 保存meeting_id供后续测试使用
         self.meeting_id = meeting["id"]
 
+    @pytest.mark.slow
     async def test_05_verify_generated_content_follows_template(
-        self,
-        async_client_with_aws,
-        custom_template_data,
-        meeting_text_for_template
+        self, async_client_with_aws, meetings_for_template
     ):
         """
         测试步骤5: 验证生成的内容遵循自定义模板结构
@@ -259,33 +398,14 @@ class TestCustomTemplateWorkflow:
         """
         client, bucket, s3_client = async_client_with_aws
 
-        # 创建模板
-        template_response = await client.post(
-            "/api/v1/templates",
-            json=custom_template_data
-        )
-        template_id = template_response.json()["id"]
+        # 使用完整文本创建的会议
+        meeting_id = parse_json(meetings_for_template["complete"])["id"]
 
-        # 创建会议
-        meeting_response = await client.post(
-            "/api/v1/meetings",
-            data={
-                "input_type": "text",
-                "text_content": meeting_text_for_template,
-                "template_id": template_id
-            }
-        )
-        meeting_id = meeting_response.json()["id"]
-
-        # 等待处理完成 (模拟轮询)
-        # 在实际实现中，这里应该轮询直到status变为completed
-        # 现在我们直接查询会议详情
-
-        # 获取会议详情
-        detail_response = await client.get(f"/api/v1/meetings/{meeting_id}")
+        # 轮询直到draft阶段处理结束
+        detail_response = await wait_for_stage(client, meeting_id, "draft")
         assert detail_response.status_code == 200
 
-        meeting_detail = detail_response.json()
+        meeting_detail = parse_json(detail_response)
 
         # 验证会议数据包含stages
         assert "stages" in meeting_detail, "会议应包含处理阶段数据"
@@ -306,62 +426,39 @@ class TestCustomTemplateWorkflow:
                 assert "发现问题" in content or "findings" in content.lower()
                 assert "改进建议" in content or "recommendations" in content.lower()
 
+    @pytest.mark.parametrize(
+        "payload,expected",
+        [
+            pytest.param({"structure": {"sections": []}}, {422}, id="missing_name"),
+            pytest.param({"name": "测试模板"}, {422}, id="missing_structure"),
+            # 空sections应该被接受或返回400 (取决于业务规则)
+            pytest.param(
+                {"name": "测试模板", "structure": {"sections": []}},
+                {201, 400},
+                id="empty_sections"
+            ),
+        ]
+    )
     async def test_06_validate_template_structure(
-        self, async_client_with_aws
+        self, async_client_with_aws, payload, expected
     ):
         """
         测试步骤6: 验证模板结构验证逻辑
 
         验证:
-        - 缺少必需字段时返回400错误
+        - 缺少必需字段时返回422错误
         - 无效的结构被拒绝
         """
         client, bucket, s3_client = async_client_with_aws
 
-        # 测试缺少name字段
-        invalid_template_1 = {
-            "structure": {
-                "sections": []
-            }
-        }
-
-        response_1 = await client.post(
-            "/api/v1/templates",
-            json=invalid_template_1
-        )
-        assert response_1.status_code == 422, "缺少name应返回422"
-
-        # 测试缺少structure字段
-        invalid_template_2 = {
-            "name": "测试模板"
-        }
-
-        response_2 = await client.post(
-            "/api/v1/templates",
-            json=invalid_template_2
-        )
-        assert response_2.status_code == 422, "缺少structure应返回422"
-
-        # 测试空sections
-        invalid_template_3 = {
-            "name": "测试模板",
-            "structure": {
-                "sections": []
-            }
-        }
-
-        response_3 = await client.post(
-            "/api/v1/templates",
-            json=invalid_template_3
+        response = await client.post("/api/v1/templates", json=payload)
+        assert response.status_code in expected, (
+            f"期望{expected}，实际{response.status_code}，响应: {response.text}"
         )
-        # 应该被接受或返回400 (取决于业务规则)
-        assert response_3.status_code in [201, 400]
 
+    @pytest.mark.slow
     async def test_07_required_fields_extraction(
-        self,
-        async_client_with_aws,
-        custom_template_data,
-        meeting_text_for_template
+        self, async_client_with_aws, meetings_for_template
     ):
         """
         测试步骤7: 验证必需字段提取逻辑
@@ -372,35 +469,14 @@ class TestCustomTemplateWorkflow:
         """
         client, bucket, s3_client = async_client_with_aws
 
-        # 创建模板
-        template_response = await client.post(
-            "/api/v1/templates",
-            json=custom_template_data
-        )
-        template_id = template_response.json()["id"]
-
-        # 使用不完整的文本创建会议 (缺少某些required字段的内容)
-        incomplete_text = """
-        今天进行了代码评审。
-        评审人：张工
-        发现了一些问题需要改进。
-        """
-
-        meeting_response = await client.post(
-            "/api/v1/meetings",
-            data={
-                "input_type": "text",
-                "text_content": incomplete_text,
-                "template_id": template_id
-            }
-        )
-
+        # 使用不完整的文本创建的会议 (缺少某些required字段的内容)
+        meeting_response = meetings_for_template["incomplete"]
         assert meeting_response.status_code == 201
-        meeting_id = meeting_response.json()["id"]
+        meeting_id = parse_json(meeting_response)["id"]
 
-        # 获取会议详情
-        detail_response = await client.get(f"/api/v1/meetings/{meeting_id}")
-        meeting_detail = detail_response.json()
+        # 轮询直到draft阶段处理结束
+        detail_response = await wait_for_stage(client, meeting_id, "draft")
+        meeting_detail = parse_json(detail_response)
 
         # 验证系统处理了不完整的输入
         # 根据业务逻辑，可能：
@@ -410,7 +486,7 @@ class TestCustomTemplateWorkflow:
         assert "status" in meeting_detail
 
     async def test_08_get_template_by_id(
-        self, async_client_with_aws, custom_template_data
+        self, async_client_with_aws, created_template
     ):
         """
         测试步骤8: 根据ID获取单个模板
@@ -420,19 +496,13 @@ class TestCustomTemplateWorkflow:
         - 不存在的模板返回404
         """
         client, bucket, s3_client = async_client_with_aws
-
-        # 创建模板
-        create_response = await client.post(
-            "/api/v1/templates",
-            json=custom_template_data
-        )
-        template_id = create_response.json()["id"]
+        template_id = created_template["id"]
 
         # 获取模板详情
         get_response = await client.get(f"/api/v1/templates/{template_id}")
         assert get_response.status_code == 200
 
-        template = get_response.json()
+        template = parse_json(get_response)
         assert template["id"] == template_id
         assert template["name"] == "技术评审模板"
 
@@ -441,17 +511,18 @@ class TestCustomTemplateWorkflow:
         not_found_response = await client.get(f"/api/v1/templates/{fake_uuid}")
         assert not_found_response.status_code == 404
 
+    @pytest.mark.slow
     async def test_09_end_to_end_custom_template_workflow(
         self,
         async_client_with_aws,
-        custom_template_data,
+        created_template,
         meeting_text_for_template
     ):
         """
         测试步骤9: 完整端到端工作流
 
         模拟场景5的完整流程:
-        1. 创建自定义模板
+        1. 创建自定义模板 (由created_template完成)
         2. 查询并验证模板存在
         3. 使用模板创建会议
         4. 验证会议使用了正确的模板
@@ -459,41 +530,44 @@ class TestCustomTemplateWorkflow:
         """
         client, bucket, s3_client = async_client_with_aws
 
-        # 步骤1: 创建模板
-        template_response = await client.post(
-            "/api/v1/templates",
-            json=custom_template_data
+        # 步骤1: 使用类内共享的已创建模板
+        template_id = created_template["id"]
+
+        # 步骤2、3互不依赖: 查询模板列表与创建会议并发执行
+        list_response, meeting_response = await asyncio.gather(
+            client.get("/api/v1/templates"),
+            client.post(
+                "/api/v1/meetings",
+                data={
+                    "input_type": "text",
+                    "text_content": meeting_text_for_template,
+                    "template_id": template_id
+                }
+            )
         )
-        assert template_response.status_code == 201
-        template_id = template_response.json()["id"]
 
         # 步骤2: 验证模板可以查询到
-        list_response = await client.get("/api/v1/templates")
-        templates = list_response.json()
+        templates = parse_json(list_response)
         assert any(t["id"] == template_id for t in templates)
 
         # 步骤3: 使用模板创建会议
-        meeting_response = await client.post(
-            "/api/v1/meetings",
-            data={
-                "input_type": "text",
-                "text_content": meeting_text_for_template,
-                "template_id": template_id
-            }
-        )
         assert meeting_response.status_code == 201
-        meeting_id = meeting_response.json()["id"]
+        meeting_id = parse_json(meeting_response)["id"]
+
+        # 步骤4、5只依赖meeting_id: 获取详情与导出并发执行
+        detail_response, export_response = await asyncio.gather(
+            client.get(f"/api/v1/meetings/{meeting_id}"),
+            client.get(
+                f"/api/v1/meetings/{meeting_id}/export",
+                params={"stage": "draft"}
+            )
+        )
 
         # 步骤4: 验证会议使用了正确的模板
-        detail_response = await client.get(f"/api/v1/meetings/{meeting_id}")
-        meeting = detail_response.json()
+        meeting = parse_json(detail_response)
         assert meeting["template_id"] == template_id
 
         # 步骤5: 导出会议记录 (假设有export端点)
-        export_response = await client.get(
-            f"/api/v1/meetings/{meeting_id}/export",
-            params={"stage": "draft"}
-        )
 
         # 导出可能需要会议处理完成，这里至少验证端点存在
         # 实际状态码取决于会议的处理状态
@@ -512,136 +586,106 @@ class TestCustomTemplateWorkflow:
         """
         client, bucket, s3_client = async_client_with_aws
 
-        complex_template = {
-            "name": "全面会议模板",
-            "structure": {
-                "sections": [
-                    {
-                        "name": "基本信息",
-                        "fields": [
-                            {"key": "title", "label": "标题", "required": True},
-                            {"key": "date", "label": "日期", "required": True},
-                            {"key": "location", "label": "地点", "required": False}
-                        ]
-                    },
-                    {
-                        "name": "参会人员",
-                        "fields": [
-                            {"key": "participants", "label": "参会者", "required": True},
-                            {"key": "absentees", "label": "缺席者", "required": False}
-                        ]
-                    },
-                    {
-                        "name": "会议内容",
-                        "fields": [
-                            {"key": "topics", "label": "讨论议题", "required": True},
-                            {"key": "decisions", "label": "决策", "required": True},
-                            {"key": "action_items", "label": "行动项", "required": True}
-                        ]
-                    },
-                    {
-                        "name": "附加信息",
-                        "fields": [
-                            {"key": "notes", "label": "备注", "required": False},
-                            {"key": "next_meeting", "label": "下次会议", "required": False}
-                        ]
-                    }
-                ]
-            }
-        }
-
         response = await client.post(
             "/api/v1/templates",
-            json=complex_template
+            json=COMPLEX_TEMPLATE_DICT
         )
 
         assert response.status_code == 201
-        template = response.json()
+        template = parse_json(response)
 
-        # 验证结构完整性
+        # 验证结构完整性: 比较结构哈希，逐项的可读比对见test_01
         assert len(template["structure"]["sections"]) == 4
-        assert template["structure"]["sections"][0]["name"] == "基本信息"
-        assert template["structure"]["sections"][2]["name"] == "会议内容"
+        structure_hash = blake2b(
+            orjson.dumps(template["structure"], option=orjson.OPT_SORT_KEYS)
+        ).digest()
+        assert structure_hash == COMPLEX_STRUCTURE_HASH, "返回的模板结构应与输入一致"
 
 
 @pytest.mark.integration
 class TestTemplateEdgeCases:
     """模板边界情况测试"""
 
-    async def test_duplicate_template_names(self, async_client_with_aws):
-        """测试重复模板名称处理"""
-        client, bucket, s3_client = async_client_with_aws
-
-        template_data = {
-            "name": "重复测试模板",
-            "structure": {
-                "sections": [
-                    {
-                        "name": "测试",
-                        "fields": [{"key": "test", "label": "测试", "required": True}]
+    @pytest.mark.parametrize(
+        "payload,expected,n_creates",
+        [
+            # 同名模板应该被允许，因为ID不同
+            pytest.param(
+                {
+                    "name": "重复测试模板",
+                    "structure": {
+                        "sections": [
+                            {
+                                "name": "测试",
+                                "fields": [{"key": "test", "label": "测试", "required": True}]
+                            }
+                        ]
                     }
-                ]
-            }
-        }
-
-        # 创建第一个模板
-        response1 = await client.post("/api/v1/templates", json=template_data)
-        assert response1.status_code == 201
-
-        # 创建同名模板 (应该被允许，因为ID不同)
-        response2 = await client.post("/api/v1/templates", json=template_data)
-        assert response2.status_code == 201
-
-        # 验证两个模板ID不同
-        assert response1.json()["id"] != response2.json()["id"]
-
-    async def test_template_with_special_characters(self, async_client_with_aws):
-        """测试包含特殊字符的模板"""
-        client, bucket, s3_client = async_client_with_aws
-
-        template_data = {
-            "name": "特殊字符模板 !@#$%^&*()",
-            "structure": {
-                "sections": [
-                    {
-                        "name": "测试 & 验证",
-                        "fields": [
+                },
+                {201},
+                2,
+                id="duplicate_names"
+            ),
+            pytest.param(
+                {
+                    "name": "特殊字符模板 !@#$%^&*()",
+                    "structure": {
+                        "sections": [
                             {
-                                "key": "test_field",
-                                "label": "字段<标签>",
-                                "required": True
+                                "name": "测试 & 验证",
+                                "fields": [
+                                    {
+                                        "key": "test_field",
+                                        "label": "字段<标签>",
+                                        "required": True
+                                    }
+                                ]
                             }
                         ]
                     }
-                ]
-            }
-        }
-
-        response = await client.post("/api/v1/templates", json=template_data)
-        assert response.status_code == 201
-
-        template = response.json()
-        assert template["name"] == "特殊字符模板 !@#$%^&*()"
+                },
+                {201},
+                1,
+                id="special_characters"
+            ),
+            # 根据业务规则，可能接受或拒绝中文key
+            pytest.param(
+                {
+                    "name": "中文key模板",
+                    "structure": {
+                        "sections": [
+                            {
+                                "name": "信息",
+                                "fields": [
+                                    {"key": "标题", "label": "会议标题", "required": True},
+                                    {"key": "日期", "label": "会议日期", "required": True}
+                                ]
+                            }
+                        ]
+                    }
+                },
+                {201, 400, 422},
+                1,
+                id="chinese_keys"
+            ),
+        ]
+    )
+    async def test_template_edge_case(
+        self, async_client_with_aws, payload, expected, n_creates
+    ):
+        """测试重复名称、特殊字符、中文key等边界模板的创建
 
-    async def test_template_with_chinese_keys(self, async_client_with_aws):
-        """测试使用中文key的模板"""
+        同一payload并发创建n_creates次，创建成功时名称应原样保存且每次ID都不同
+        """
         client, bucket, s3_client = async_client_with_aws
 
-        template_data = {
-            "name": "中文key模板",
-            "structure": {
-                "sections": [
-                    {
-                        "name": "信息",
-                        "fields": [
-                            {"key": "标题", "label": "会议标题", "required": True},
-                            {"key": "日期", "label": "会议日期", "required": True}
-                        ]
-                    }
-                ]
-            }
-        }
+        responses = await asyncio.gather(*[
+            client.post("/api/v1/templates", json=payload) for _ in range(n_creates)
+        ])
+        assert all(r.status_code in expected for r in responses), (
+            [r.status_code for r in responses]
+        )
 
-        response = await client.post("/api/v1/templates", json=template_data)
-        # 根据业务规则，可能接受或拒绝中文key
-        assert response.status_code in [201, 400, 422]
+        created = [parse_json(r) for r in responses if r.status_code == 201]
+        assert all(t["name"] == payload["name"] for t in created)
+        assert len({t["id"] for t in created}) == len(created)
@@ -23,20 +23,42 @@
 - 验证工作流状态机转换
 """
 
+import asyncio
+import copy
 import json
 from datetime import datetime, timezone
 from typing import Dict, Any
 from uuid import uuid4
 
+import orjson
 import pytest
 import boto3
-from httpx import AsyncClient
 
 
-@pytest.fixture
-def draft_meeting_data() -> Dict[str, Any]:
+async def wait_for_status(client, meeting_id, statuses=("optimized", "completed"), timeout=10):
+    """轮询会议详情直到状态进入statuses，返回最后一次的会议数据
+
+    轮询间隔从5ms开始指数退避，上限0.2秒；后台优化通常几十毫秒内完成，
+    不再固定等待数秒。超时返回最后一次结果，由调用方断言
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    delay = 0.005
+
+    while True:
+        response = await client.get(f"/api/v1/meetings/{meeting_id}")
+        meeting_data = response.json()
+        if meeting_data.get("status") in statuses or loop.time() >= deadline:
+            return meeting_data
+
+        await asyncio.sleep(delay)
+        delay = min(0.2, delay * 2)
+
+
+@pytest.fixture(scope="class")
+def draft_meeting_template() -> Dict[str, Any]:
     """
-    创建一个包含draft阶段的会议记录数据
+    创建一个包含draft阶段的会议记录数据(每个测试类只构建一次)
 
     这个会议记录有已知的问题:
     1. 决策事项中"AI功能"应该是"推荐功能"
@@ -97,6 +119,21 @@ def draft_meeting_data() -> Dict[str, Any]:
 
 
 @pytest.fixture
+def draft_meeting_data(draft_meeting_template) -> Dict[str, Any]:
+    """
+    draft会议记录的深拷贝,换上新的会议ID
+
+    提交反馈会改变S3中会议的状态,每个测试需要独立的会议ID;
+    深拷贝保证测试修改字典时不影响类内共享的模板
+    """
+    meeting_data = copy.deepcopy(draft_meeting_template)
+    meeting_id = str(uuid4())
+    meeting_data["id"] = meeting_id
+    meeting_data["audio_s3_key"] = f"audio/{meeting_id}.mp3"
+    return meeting_data
+
+
+@pytest.fixture(scope="class")
 def user_feedbacks() -> list[Dict[str, Any]]:
     """
     用户提交的反馈数据
@@ -121,36 +158,47 @@ def user_feedbacks() -> list[Dict[str, Any]]:
     ]
 
 
-@pytest.fixture
-def optimized_content() -> str:
-    """
-    Nova Pro优化后的会议记录内容
+# ============================================================================
+# 反馈优化结果断言辅助函数
+# ============================================================================
 
-    这是模拟Bedrock返回的改进后的内容:
-    - 修正了"AI功能"为"推荐功能"
-    - 添加了王五的行动项
-    """
-    return """# 会议记录
+def _assert_state_transitions(meeting: Dict[str, Any]) -> None:
+    """工作流走完: 会议进入optimized/completed,各阶段均已完成"""
+    assert meeting["status"] in ["optimized", "completed"]
+    assert meeting["stages"]["draft"]["status"] == "completed"
+    assert meeting["stages"]["review"]["status"] == "completed"
+    assert meeting["stages"]["final"]["status"] == "completed"
 
-## 会议基本信息
-- 会议主题: 产品路线图讨论
-- 会议日期: 2025-10-01
-- 参与者: 张三, 李四, 王五
 
-## 讨论议题
-1. Q4功能规划
-2. 用户反馈分析
-3. 技术债务优先级
+def _assert_optimized_content(final_content: str) -> None:
+    """final内容修正了"AI功能"并补充了王五的行动项"""
+    assert "推荐功能" in final_content
+    assert "AI功能" not in final_content
+    assert "王五" in final_content
+    assert "评估技术债务" in final_content
 
-## 决策事项
-- 决策1: 优先开发推荐功能
-- 决策2: 延后移动端适配
 
-## 行动项
-- [ ] 张三: 完成推荐功能PRD (截止日期: 10-08)
-- [ ] 李四: 分析用户反馈数据 (截止日期: 10-05)
-- [ ] 王五: 评估技术债务并制定优先级 (截止日期: 10-10)
-"""
+def _assert_content_diff(draft_content: str, final_content: str) -> None:
+    """draft包含标记的问题,final中已修正"""
+    assert "AI功能" in draft_content
+    assert "王五: 评估" not in draft_content
+    assert "推荐功能" in final_content
+    assert "王五: 评估技术债务" in final_content
+
+
+def _assert_resolution_tracking(
+    meeting: Dict[str, Any], user_feedbacks: list[Dict[str, Any]]
+) -> None:
+    """每条反馈都标记为已解决,带解决时间戳并保留原始信息"""
+    feedbacks = meeting["stages"]["review"]["feedbacks"]
+    assert len(feedbacks) == len(user_feedbacks)
+
+    for feedback in feedbacks:
+        assert feedback["is_resolved"] is True
+        assert feedback.get("resolved_at") is not None
+        assert "feedback_type" in feedback
+        assert "location" in feedback
+        assert "comment" in feedback
 
 
 # ============================================================================
@@ -165,296 +213,57 @@ class TestFeedbackOptimizationFlow:
 
     测试TDD原则: 这个测试必须先编写,并且预期失败
     因为相关的API端点、服务和存储层尚未实现
-    """
-
-    async def test_submit_feedback_and_optimize(
-        self,
-        s3_client,
-        test_bucket,
-        draft_meeting_data,
-        user_feedbacks,
-        optimized_content
-    ):
-        """
-        测试场景: 提交反馈并触发优化流程
-
-        步骤:
-        1. 在S3中创建一个draft状态的会议记录
-        2. 通过API提交用户反馈
-        3. 验证会议记录进入优化阶段
-        4. 模拟Bedrock返回优化后的内容
-        5. 验证final阶段的内容已改进
-        6. 验证反馈标记为已解决
-        """
-        # Step 1: 在S3中保存draft会议记录
-        meeting_id = draft_meeting_data["id"]
-        s3_client.put_object(
-            Bucket=test_bucket,
-            Key=f"meetings/{meeting_id}.json",
-            Body=json.dumps(draft_meeting_data, ensure_ascii=False),
-            ContentType="application/json"
-        )
-
-        # Step 2: 通过API提交反馈
-        # 注意: 这个测试预期会失败,因为API尚未实现
-        from src.api.main import app  # 这将导致ImportError
-
-        async with AsyncClient(app=app, base_url="http://test") as client:
-            response = await client.post(
-                f"/api/v1/meetings/{meeting_id}/feedback",
-                json={"feedbacks": user_feedbacks}
-            )
-
-            # 验证API响应
-            assert response.status_code == 202
-            response_data = response.json()
-            assert response_data["message"] == "反馈已提交,优化中..."
-            assert response_data["meeting_id"] == meeting_id
-
-        # Step 3: 验证会议记录状态转换到optimizing
-        obj = s3_client.get_object(
-            Bucket=test_bucket,
-            Key=f"meetings/{meeting_id}.json"
-        )
-        updated_meeting = json.loads(obj["Body"].read())
-        assert updated_meeting["status"] == "optimizing"
-
-        # Step 4: 模拟Bedrock优化调用
-        # 在实际实现中,这会由WorkflowService触发
-        # 这里我们模拟Bedrock返回优化后的内容
-
-        # Step 5: 等待优化完成 (在实际测试中可能需要轮询或使用异步任务)
-        # 这里我们直接验证最终状态
 
-        async with AsyncClient(app=app, base_url="http://test") as client:
-            # 轮询直到优化完成
-            for _ in range(10):
-                response = await client.get(f"/api/v1/meetings/{meeting_id}")
-                meeting_data = response.json()
-
-                if meeting_data["status"] in ["optimized", "completed"]:
-                    break
-
-                # 等待异步处理
-                import asyncio
-                await asyncio.sleep(0.5)
-
-        # Step 6: 验证final阶段内容已改进
-        final_obj = s3_client.get_object(
-            Bucket=test_bucket,
-            Key=f"meetings/{meeting_id}.json"
-        )
-        final_meeting = json.loads(final_obj["Body"].read())
-
-        # 验证状态
-        assert final_meeting["status"] in ["optimized", "completed"]
-
-        # 验证final阶段存在
-        assert "final" in final_meeting["stages"]
-        final_stage = final_meeting["stages"]["final"]
-        assert final_stage["status"] == "completed"
-        assert final_stage["content"] is not None
-
-        # 验证内容改进: "AI功能" -> "推荐功能"
-        final_content = final_stage["content"]
-        assert "推荐功能" in final_content
-        assert "AI功能" not in final_content or final_content.count("AI功能") == 0
-
-        # 验证王五的行动项已添加
-        assert "王五" in final_content
-        assert "评估技术债务" in final_content
-
-        # Step 7: 验证反馈标记为已解决
-        review_stage = final_meeting["stages"]["review"]
-        assert "feedbacks" in review_stage
-
-        for feedback in review_stage["feedbacks"]:
-            assert feedback["is_resolved"] is True
-            assert "resolved_at" in feedback
+    test_full_feedback_optimization_flow只跑一次流程并检查全部不变量
+    """
 
-    async def test_draft_vs_final_content_diff(
+    async def test_full_feedback_optimization_flow(
         self,
+        async_client,
         s3_client,
         test_bucket,
         draft_meeting_data,
         user_feedbacks
     ):
         """
-        测试验证: draft和final内容的差异
+        测试场景: 提交反馈→优化完成的端到端流程,一次执行验证所有结果
 
         验证点:
-        - draft内容包含错误("AI功能")
-        - final内容修正了错误("推荐功能")
-        - final内容添加了缺失信息(王五的行动项)
+        - 提交反馈返回202
+        - 工作流状态转换完成
+        - final内容改进了标记的问题,且与draft存在预期差异
+        - 反馈标记为已解决
         """
         meeting_id = draft_meeting_data["id"]
-
-        # 保存draft会议记录
         s3_client.put_object(
             Bucket=test_bucket,
             Key=f"meetings/{meeting_id}.json",
-            Body=json.dumps(draft_meeting_data, ensure_ascii=False),
+            Body=orjson.dumps(draft_meeting_data),
             ContentType="application/json"
         )
 
-        # 这将失败因为API尚未实现
-        from src.api.main import app
-
-        async with AsyncClient(app=app, base_url="http://test") as client:
-            # 获取draft内容
-            draft_response = await client.get(
-                f"/api/v1/meetings/{meeting_id}/export?stage=draft"
-            )
-            assert draft_response.status_code == 200
-            draft_content = draft_response.text
-
-            # 提交反馈
-            await client.post(
-                f"/api/v1/meetings/{meeting_id}/feedback",
-                json={"feedbacks": user_feedbacks}
-            )
-
-            # 等待优化完成
-            import asyncio
-            await asyncio.sleep(2)
-
-            # 获取final内容
-            final_response = await client.get(
-                f"/api/v1/meetings/{meeting_id}/export?stage=final"
-            )
-            assert final_response.status_code == 200
-            final_content = final_response.text
-
-            # 验证差异
-            # draft包含错误
-            assert "AI功能" in draft_content
-            assert "王五" not in draft_content or "王五: 评估" not in draft_content
-
-            # final修正了错误
-            assert "推荐功能" in final_content
-            assert "王五: 评估技术债务" in final_content
-
-    async def test_workflow_state_transitions(
-        self,
-        s3_client,
-        test_bucket,
-        draft_meeting_data,
-        user_feedbacks
-    ):
-        """
-        测试验证: 工作流状态机转换
-
-        预期状态转换:
-        draft → reviewing → optimizing → optimized → completed
-        """
-        meeting_id = draft_meeting_data["id"]
-
-        # 初始状态: reviewing
-        assert draft_meeting_data["status"] == "reviewing"
-
-        s3_client.put_object(
-            Bucket=test_bucket,
-            Key=f"meetings/{meeting_id}.json",
-            Body=json.dumps(draft_meeting_data, ensure_ascii=False),
-            ContentType="application/json"
+        draft_response = await async_client.get(
+            f"/api/v1/meetings/{meeting_id}/export?stage=draft"
         )
+        assert draft_response.status_code == 200
 
-        # 这将失败因为API尚未实现
-        from src.api.main import app
-
-        async with AsyncClient(app=app, base_url="http://test") as client:
-            # 提交反馈后,状态应该变为optimizing
-            response = await client.post(
-                f"/api/v1/meetings/{meeting_id}/feedback",
-                json={"feedbacks": user_feedbacks}
-            )
-            assert response.status_code == 202
-
-            # 检查状态变化
-            status_response = await client.get(f"/api/v1/meetings/{meeting_id}")
-            status_data = status_response.json()
-            assert status_data["status"] == "optimizing"
-
-            # 等待优化完成
-            import asyncio
-            for attempt in range(20):
-                await asyncio.sleep(0.5)
-                status_response = await client.get(f"/api/v1/meetings/{meeting_id}")
-                status_data = status_response.json()
-
-                if status_data["status"] in ["optimized", "completed"]:
-                    break
-
-            # 最终状态应该是optimized或completed
-            assert status_data["status"] in ["optimized", "completed"]
-
-            # 验证阶段完成
-            assert status_data["stages"]["draft"]["status"] == "completed"
-            assert status_data["stages"]["review"]["status"] == "completed"
-            assert status_data["stages"]["final"]["status"] == "completed"
-
-    async def test_feedback_resolution_tracking(
-        self,
-        s3_client,
-        test_bucket,
-        draft_meeting_data,
-        user_feedbacks
-    ):
-        """
-        测试验证: 反馈解决追踪
-
-        验证点:
-        - 每个反馈都有is_resolved标志
-        - 优化后is_resolved应该为true
-        - 反馈包含resolved_at时间戳
-        """
-        meeting_id = draft_meeting_data["id"]
-
-        s3_client.put_object(
-            Bucket=test_bucket,
-            Key=f"meetings/{meeting_id}.json",
-            Body=json.dumps(draft_meeting_data, ensure_ascii=False),
-            ContentType="application/json"
+        response = await async_client.post(
+            f"/api/v1/meetings/{meeting_id}/feedback",
+            json={"feedbacks": user_feedbacks}
         )
+        assert response.status_code == 202
+        assert response.json()["meeting_id"] == meeting_id
 
-        # 这将失败因为API尚未实现
-        from src.api.main import app
-
-        async with AsyncClient(app=app, base_url="http://test") as client:
-            # 提交反馈
-            response = await client.post(
-                f"/api/v1/meetings/{meeting_id}/feedback",
-                json={"feedbacks": user_feedbacks}
-            )
-            assert response.status_code == 202
-
-            # 等待优化完成
-            import asyncio
-            await asyncio.sleep(2)
-
-            # 获取最终会议记录
-            final_response = await client.get(f"/api/v1/meetings/{meeting_id}")
-            final_data = final_response.json()
-
-            # 验证反馈解决状态
-            review_stage = final_data["stages"]["review"]
-            feedbacks = review_stage["feedbacks"]
-
-            assert len(feedbacks) == len(user_feedbacks)
-
-            for feedback in feedbacks:
-                # 每个反馈都应该被标记为已解决
-                assert "is_resolved" in feedback
-                assert feedback["is_resolved"] is True
-
-                # 应该有解决时间戳
-                assert "resolved_at" in feedback
-                assert feedback["resolved_at"] is not None
+        final_meeting = await wait_for_status(async_client, meeting_id)
+        final_response = await async_client.get(
+            f"/api/v1/meetings/{meeting_id}/export?stage=final"
+        )
+        assert final_response.status_code == 200
 
-                # 应该保留原始反馈信息
-                assert "feedback_type" in feedback
-                assert "location" in feedback
-                assert "comment" in feedback
+        _assert_state_transitions(final_meeting)
+        _assert_optimized_content(final_response.text)
+        _assert_content_diff(draft_response.text, final_response.text)
+        _assert_resolution_tracking(final_meeting, user_feedbacks)
 
 
 # ============================================================================
@@ -468,6 +277,7 @@ class TestFeedbackOptimizationEdgeCases:
 
     async def test_submit_feedback_to_non_reviewing_meeting(
         self,
+        async_client,
         s3_client,
         test_bucket
     ):
@@ -486,25 +296,23 @@ class TestFeedbackOptimizationEdgeCases:
         s3_client.put_object(
             Bucket=test_bucket,
             Key=f"meetings/{meeting_id}.json",
-            Body=json.dumps(meeting_data),
+            Body=orjson.dumps(meeting_data),
             ContentType="application/json"
         )
 
-        from src.api.main import app
-
-        async with AsyncClient(app=app, base_url="http://test") as client:
-            response = await client.post(
-                f"/api/v1/meetings/{meeting_id}/feedback",
-                json={"feedbacks": [{"feedback_type": "inaccurate", "comment": "test"}]}
-            )
+        response = await async_client.post(
+            f"/api/v1/meetings/{meeting_id}/feedback",
+            json={"feedbacks": [{"feedback_type": "inaccurate", "comment": "test"}]}
+        )
 
-            # 应该返回冲突错误
-            assert response.status_code == 409
-            error_data = response.json()
-            assert "不允许反馈" in error_data["detail"] or "conflict" in error_data["detail"].lower()
+        # 应该返回冲突错误
+        assert response.status_code == 409
+        error_data = response.json()
+        assert "不允许反馈" in error_data["detail"] or "conflict" in error_data["detail"].lower()
 
     async def test_submit_empty_feedback(
         self,
+        async_client,
         s3_client,
         test_bucket,
         draft_meeting_data
@@ -519,38 +327,32 @@ class TestFeedbackOptimizationEdgeCases:
         s3_client.put_object(
             Bucket=test_bucket,
             Key=f"meetings/{meeting_id}.json",
-            Body=json.dumps(draft_meeting_data, ensure_ascii=False),
+            Body=orjson.dumps(draft_meeting_data),
             ContentType="application/json"
         )
 
-        from src.api.main import app
-
-        async with AsyncClient(app=app, base_url="http://test") as client:
-            response = await client.post(
-                f"/api/v1/meetings/{meeting_id}/feedback",
-                json={"feedbacks": []}
-            )
+        response = await async_client.post(
+            f"/api/v1/meetings/{meeting_id}/feedback",
+            json={"feedbacks": []}
+        )
 
-            # 可能返回400或202(跳过优化)
-            assert response.status_code in [400, 202]
+        # 可能返回400或202(跳过优化)
+        assert response.status_code in [400, 202]
 
-    async def test_feedback_to_nonexistent_meeting(self):
+    async def test_feedback_to_nonexistent_meeting(self, async_client):
         """
         测试: 向不存在的会议提交反馈
 
         预期: HTTP 404 Not Found
         """
-        from src.api.main import app
-
         fake_meeting_id = str(uuid4())
 
-        async with AsyncClient(app=app, base_url="http://test") as client:
-            response = await client.post(
-                f"/api/v1/meetings/{fake_meeting_id}/feedback",
-                json={"feedbacks": [{"feedback_type": "missing", "comment": "test"}]}
-            )
+        response = await async_client.post(
+            f"/api/v1/meetings/{fake_meeting_id}/feedback",
+            json={"feedbacks": [{"feedback_type": "missing", "comment": "test"}]}
+        )
 
-            assert response.status_code == 404
+        assert response.status_code == 404
 
 
 # ============================================================================
@@ -11,6 +11,7 @@ import asyncio
 import time
 from datetime import datetime, UTC
 from typing import List
+from uuid import uuid4
 
 import pytest
 from httpx import AsyncClient
@@ -165,8 +166,7 @@ class TestS3ConcurrencyConflict:
         repo = MeetingRepository(s3_wrapper)
 
         # 创建初始meeting
-        import uuid
-        meeting_id = str(uuid.uuid4())
+        meeting_id = str(uuid4())
         meeting = MeetingMinute(
             id=meeting_id,
             created_at=datetime.now(UTC),
@@ -280,10 +280,9 @@ class TestAPIResponseTime:
         client, test_bucket, s3_client = async_client_with_aws
 
         from src.models.meeting import ProcessingStage
-        import uuid
 
         # 创建一个带有draft内容的会议
-        meeting_id = str(uuid.uuid4())
+        meeting_id = str(uuid4())
         meeting = MeetingMinute(
             id=meeting_id,
             created_at=datetime.now(UTC),
@@ -446,10 +445,9 @@ class TestLoadUnderPressure:
         from src.models.meeting import ProcessingStage
 
         # 预先创建一些会议用于读取测试
-        import uuid
         existing_meetings = []
         for i in range(5):
-            meeting_id = str(uuid.uuid4())
+            meeting_id = str(uuid4())
             meeting = MeetingMinute(
                 id=meeting_id,
                 created_at=datetime.now(UTC),
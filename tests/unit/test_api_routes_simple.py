@@ -1,8 +1,9 @@
 """
 API路由简化测试 - 快速提升覆盖率
 """
-import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
 from fastapi import HTTPException
 
 
@@ -13,10 +14,12 @@ class TestAPIRoutesSimple:
 
     async def test_meetings_route_validation(self):
         """测试会议路由参数验证"""
-        from src.api.routes.meetings import create_meeting
-        from fastapi import UploadFile
         from io import BytesIO
 
+        from fastapi import UploadFile
+
+        from src.api.routes.meetings import create_meeting
+
         # Mock依赖
         mock_file_service = AsyncMock()
         mock_meeting_repo = AsyncMock()
@@ -117,12 +120,54 @@ class TestAPIRoutesSimple:
 
         assert exc.value.status_code == 404
 
+    async def test_stream_meeting_status_not_found(self):
+        """测试状态流: 会议不存在"""
+        from src.api.routes.meetings import stream_meeting_status
+
+        mock_repo = AsyncMock()
+        mock_repo.get.return_value = None
+
+        with pytest.raises(HTTPException) as exc:
+            await stream_meeting_status(
+                meeting_id="nonexistent-id",
+                meeting_repo=mock_repo
+            )
+
+        assert exc.value.status_code == 404
+
+    async def test_stream_meeting_status_until_final(self):
+        """测试状态流: 每次状态变化推送一条事件,进入reviewing后结束"""
+        import json
+        from datetime import UTC, datetime
+
+        from src.api.routes.meetings import stream_meeting_status
+
+        def meeting(status):
+            return MagicMock(id="m1", status=status, updated_at=datetime.now(UTC))
+
+        mock_repo = AsyncMock()
+        mock_repo.get.side_effect = [
+            meeting("draft"), meeting("draft"), meeting("reviewing")
+        ]
+
+        with patch("src.api.routes.meetings.STATUS_STREAM_POLL_INTERVAL", 0):
+            response = await stream_meeting_status(
+                meeting_id="m1",
+                meeting_repo=mock_repo
+            )
+            events = [chunk async for chunk in response.body_iterator]
+
+        assert response.media_type == "text/event-stream"
+        statuses = [json.loads(e.removeprefix("data: "))["status"] for e in events]
+        assert statuses == ["draft", "reviewing"]
+
     async def test_middleware_error_handler(self):
         """测试错误处理中间件"""
-        from src.api.middleware.error_handler import error_handler_middleware
         from fastapi import Request
         from fastapi.responses import JSONResponse
 
+        from src.api.middleware.error_handler import error_handler_middleware
+
         mock_request = MagicMock(spec=Request)
         mock_request.url.path = "/test"
         mock_request.method = "GET"
@@ -138,10 +183,11 @@ class TestAPIRoutesSimple:
 
     async def test_validation_exception_handler(self):
         """测试验证异常处理器"""
-        from src.api.middleware.error_handler import validation_exception_handler
         from fastapi import Request
         from fastapi.exceptions import RequestValidationError
 
+        from src.api.middleware.error_handler import validation_exception_handler
+
         mock_request = MagicMock(spec=Request)
         mock_request.url.path = "/test"
         mock_request.method = "POST"
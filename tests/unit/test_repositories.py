@@ -4,9 +4,13 @@ Repository层单元测试
 使用moto模拟S3服务，测试Repository的CRUD操作和边界场景
 """
 
+import gzip
+import json
+
 import pytest
 from datetime import datetime, UTC
 from uuid import uuid4
+from unittest.mock import patch
 from moto import mock_aws
 import boto3
 
@@ -209,6 +213,44 @@ class TestMeetingRepository:
         assert len(reviewing_meetings) == 1
         assert reviewing_meetings[0].id == meeting2.id
 
+    async def test_index_write_through(self, s3_setup, sample_meeting):
+        """测试内存索引建立后筛选不再扫描S3"""
+        repo, bucket_name, s3_client = s3_setup
+
+        await repo.save(sample_meeting)
+        await repo.rebuild_index()
+
+        meeting2 = sample_meeting.model_copy(
+            update={"id": str(uuid4()), "status": "reviewing"}
+        )
+
+        with patch.object(repo.s3, "list_keys", wraps=repo.s3.list_keys) as mock_list:
+            # 保存和删除写穿更新索引
+            await repo.save(meeting2)
+            reviewing = await repo.list_by_status("reviewing")
+            assert [m.id for m in reviewing] == [meeting2.id]
+
+            await repo.delete(sample_meeting.id)
+            assert await repo.list_by_status("draft") == []
+            assert [m.id for m in await repo.get_recent()] == [meeting2.id]
+
+            mock_list.assert_not_called()
+
+    async def test_index_skips_stale_summary(self, s3_setup, sample_meeting):
+        """测试索引摘要过时时按加载的最新记录重新筛选"""
+        repo, bucket_name, s3_client = s3_setup
+
+        await repo.save(sample_meeting)
+        await repo.rebuild_index()
+
+        # 另一个实例修改状态，本实例的索引摘要仍为draft
+        other_repo = MeetingRepository(repo.s3)
+        await other_repo.save(sample_meeting.model_copy(update={"status": "reviewing"}))
+
+        assert await repo.list_by_status("draft") == []
+        reviewing = await repo.list_by_status("reviewing")
+        assert [m.id for m in reviewing] == [sample_meeting.id]
+
     async def test_exists(self, s3_setup, sample_meeting):
         """测试检查会议是否存在"""
         repo, bucket_name, s3_client = s3_setup
@@ -311,6 +353,75 @@ class TestMeetingRepository:
         with pytest.raises(Exception):  # 可能是ValueError或ValidationError
             await repo.get("corrupted-id")
 
+    async def test_saved_json_is_gzip_encoded(self, s3_setup, sample_meeting):
+        """测试保存的JSON正文经过gzip压缩"""
+        repo, bucket_name, s3_client = s3_setup
+
+        await repo.save(sample_meeting)
+
+        response = s3_client.get_object(
+            Bucket=bucket_name, Key=f"meetings/{sample_meeting.id}.json"
+        )
+        assert response["ContentEncoding"] == "gzip"
+        assert response["ContentType"] == "application/json"
+
+        data = json.loads(gzip.decompress(response["Body"].read()))
+        assert data["id"] == sample_meeting.id
+        assert "__etag" not in data
+
+    async def test_get_legacy_uncompressed_json(self, s3_setup, sample_meeting):
+        """测试读取未压缩的历史JSON对象"""
+        repo, bucket_name, s3_client = s3_setup
+
+        s3_client.put_object(
+            Bucket=bucket_name,
+            Key=f"meetings/{sample_meeting.id}.json",
+            Body=sample_meeting.model_dump_json(indent=2).encode(),
+            ContentType="application/json",
+        )
+
+        retrieved = await repo.get(sample_meeting.id)
+        assert retrieved is not None
+        assert retrieved.id == sample_meeting.id
+        assert retrieved.original_text == sample_meeting.original_text
+
+    async def test_get_uses_conditional_request_when_cached(self, s3_setup, sample_meeting):
+        """测试缓存命中时使用If-None-Match条件请求"""
+        repo, bucket_name, s3_client = s3_setup
+
+        etag = await repo.save(sample_meeting)
+
+        with patch.object(repo.s3, "get_json", wraps=repo.s3.get_json) as mock_get:
+            first = await repo.get(sample_meeting.id)
+            mock_get.assert_called_once_with(
+                f"meetings/{sample_meeting.id}.json", if_none_match=etag
+            )
+
+        # 修改返回的实例不应影响缓存
+        first.stages["draft"].content = "已修改"
+        second = await repo.get(sample_meeting.id)
+        assert second.stages["draft"].content == "# 测试会议记录\n\n## 内容\n测试内容"
+        assert second.__dict__["__etag"] == etag
+
+    async def test_get_refreshes_cache_when_object_changed(self, s3_setup, sample_meeting):
+        """测试对象被其他进程修改后重新下载"""
+        repo, bucket_name, s3_client = s3_setup
+
+        await repo.save(sample_meeting)
+        assert (await repo.get(sample_meeting.id)).status == "draft"
+
+        # 另一个仓库实例（模拟其他进程）更新会议
+        other_repo = MeetingRepository(repo.s3)
+        meeting = await other_repo.get(sample_meeting.id)
+        meeting.status = "reviewing"
+        await other_repo.save(meeting)
+
+        assert (await repo.get(sample_meeting.id)).status == "reviewing"
+
+        # 删除后不再返回缓存
+        await other_repo.delete(sample_meeting.id)
+        assert await repo.get(sample_meeting.id) is None
+
     async def test_save_with_if_match(self, s3_setup, sample_meeting):
         """测试使用if_match参数保存"""
         repo, bucket_name, s3_client = s3_setup
@@ -535,6 +646,23 @@ class TestTemplateRepository:
         template_ids = {t.id for t in user_templates}
         assert sample_template.id in template_ids
 
+    async def test_list_user_templates_skips_default_object(self, s3_setup, sample_template):
+        """测试列出用户模板时不读取默认模板对象"""
+        repo, bucket_name, s3_client = s3_setup
+
+        # 默认模板已存在于S3
+        await repo.get_default()
+        await repo.save(sample_template)
+
+        user_templates = await repo.list_user_templates()
+        assert [t.id for t in user_templates] == [sample_template.id]
+
+        # 不包含默认模板时不应触发默认模板的创建
+        await repo.delete(sample_template.id)
+        s3_client.delete_object(Bucket=bucket_name, Key="templates/default.json")
+        assert await repo.list_user_templates() == []
+        assert await repo.exists("default") is False
+
     async def test_get_nonexistent_template(self, s3_setup):
         """测试获取不存在的模板返回None"""
         repo, bucket_name, s3_client = s3_setup